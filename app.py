@@ -1,8 +1,11 @@
 import streamlit as st
-from emotion_analyzer import analyze_emotion_with_model
+import pandas as pd
+from emotion_analyzer import analyze_emotion_with_model, preload_model, EmotionAnalysisError, uniform_emotions
 from image_generator import ImageGenerator
 from music_recommender import MusicRecommender
 import os
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
 
 
 # 페이지 설정
@@ -14,7 +17,24 @@ st.set_page_config(
 )
 
 
-# API 키 로드 함수
+# 앱 시작 시 KoBERT 모델 미리 로드 (프로세스당 1회)
+@st.cache_resource(show_spinner="🤖 감정 분석 모델 준비 중...")
+def warmup_emotion_model():
+    return preload_model()
+
+
+warmup_emotion_model()
+
+
+@dataclass(frozen=True)
+class ApiKeys:
+    huggingface_key: str
+    spotify_client_id: str
+    spotify_client_secret: str
+
+
+# API 키 로드 함수 (최초 1회만 로드, os.environ은 수정하지 않음)
+@st.cache_resource(show_spinner=False)
 def load_api_keys():
     """Streamlit Secrets 또는 .env에서 API 키 로드"""
     try:
@@ -30,7 +50,35 @@ def load_api_keys():
         spotify_client_id = os.getenv("SPOTIFY_CLIENT_ID")
         spotify_client_secret = os.getenv("SPOTIFY_CLIENT_SECRET")
     
-    return huggingface_key, spotify_client_id, spotify_client_secret
+    return ApiKeys(huggingface_key, spotify_client_id, spotify_client_secret)
+
+
+# 같은 텍스트 재분석 방지 (KoBERT 추론 결과 캐시)
+# 실패 시 예외가 발생하므로 균등 분포는 캐시되지 않음
+@st.cache_data(ttl=3600, show_spinner=False)
+def cached_analyze_emotion(text):
+    return analyze_emotion_with_model(text, verbose=False, fallback=False)
+
+
+def analyze_emotion(text):
+    """
+    캐시된 감정 분석 (실패 시 캐시 없이 균등 분포 반환 → 다음 요청에서 다시 분석)
+    """
+    try:
+        return cached_analyze_emotion(text)
+    except EmotionAnalysisError:
+        return uniform_emotions()
+
+
+# 생성기/추천기는 세션 간 재사용
+@st.cache_resource(show_spinner=False)
+def get_image_generator():
+    return ImageGenerator()
+
+
+@st.cache_resource(show_spinner=False)
+def get_music_recommender(client_id, client_secret):
+    return MusicRecommender(client_id=client_id, client_secret=client_secret)
 
 
 # CSS 스타일
@@ -212,13 +260,10 @@ with col1:
             with st.spinner("✨ 감정을 분석하고 예술 작품을 만드는 중..."):
                 try:
                     # API 키 로드
-                    hf_key, spotify_id, spotify_secret = load_api_keys()
-                    os.environ["HUGGINGFACE_API_KEY"] = hf_key
-                    os.environ["SPOTIFY_CLIENT_ID"] = spotify_id
-                    os.environ["SPOTIFY_CLIENT_SECRET"] = spotify_secret
+                    api_keys = load_api_keys()
                     
                     # 감정 분석
-                    emotions = analyze_emotion_with_model(user_text)
+                    emotions = analyze_emotion(user_text)
                     main_emotion = max(emotions.items(), key=lambda x: x[1])
                     
                     result = {
@@ -226,34 +271,49 @@ with col1:
                         'main_emotion': main_emotion[0],
                         'emotion_score': main_emotion[1],
                         'all_emotions': emotions,
-                        'image_path': None,
+                        'image_bytes': None,
                         'music': [],
                         'style': art_style
                     }
                     
-                    # 이미지 생성
-                    if generate_image:
-                        image_gen = ImageGenerator()
-                        image_path = 'emotion_gradient.png'
-                        image_gen.generate_image(
-                            emotions, 
-                            save_path=image_path,
-                            style=art_style
-                        )
-                        result['image_path'] = image_path
-                    
-                    # 🆕 음악 추천 (비율 기반!)
-                    if recommend_music:
-                        try:
-                            music_rec = MusicRecommender()
-                            # ✅ 변경: recommend_music_by_emotions 사용
-                            tracks = music_rec.recommend_music_by_emotions(
-                                emotions,  # 모든 감정 비율 전달
-                                total_tracks=num_tracks
+                    # 이미지 생성(CPU)과 음악 추천(네트워크)을 동시에 실행
+                    with ThreadPoolExecutor(max_workers=2) as executor:
+                        image_future = None
+                        music_future = None
+                        
+                        # 이미지 생성
+                        if generate_image:
+                            image_gen = get_image_generator()
+                            image_future = executor.submit(
+                                image_gen.generate_image_bytes,
+                                emotions, 
+                                style=art_style
                             )
-                            result['music'] = tracks
-                        except Exception as e:
-                            st.warning(f"음악 추천 중 오류: {str(e)}")
+                        
+                        # 🆕 음악 추천 (비율 기반!)
+                        if recommend_music:
+                            try:
+                                music_rec = get_music_recommender(
+                                    api_keys.spotify_client_id,
+                                    api_keys.spotify_client_secret
+                                )
+                                # ✅ 변경: recommend_music_by_emotions 사용
+                                music_future = executor.submit(
+                                    music_rec.recommend_music_by_emotions,
+                                    emotions,  # 모든 감정 비율 전달
+                                    total_tracks=num_tracks
+                                )
+                            except Exception as e:
+                                st.warning(f"음악 추천 중 오류: {str(e)}")
+                        
+                        if music_future:
+                            try:
+                                result['music'] = music_future.result()
+                            except Exception as e:
+                                st.warning(f"음악 추천 중 오류: {str(e)}")
+                        
+                        if image_future:
+                            result['image_bytes'] = image_future.result()
                     
                     st.session_state.result = result
                     st.success("✅ 완료!")
@@ -298,29 +358,38 @@ with col2:
             reverse=True
         )
         
-        for emotion, score in sorted_emotions:
-            col_a, col_b = st.columns([3, 1])
-            with col_a:
-                st.progress(score / 100, text=f"{emotion_emoji.get(emotion, '🎭')} {emotion}")
-            with col_b:
-                st.markdown(f"**{score:.1f}%**")
+        # 차트 1개 + 범례 1줄로 렌더링 (감정별 위젯 생성 X)
+        # 라벨 앞 순위 번호로 차트 축도 비율 순서 유지
+        distribution = pd.Series(
+            {
+                f"{i}. {emotion_emoji.get(emotion, '🎭')} {emotion}": score
+                for i, (emotion, score) in enumerate(sorted_emotions, 1)
+            },
+            name='%'
+        )
+        st.bar_chart(distribution)
+        st.markdown(" · ".join(
+            f"{emotion_emoji.get(emotion, '🎭')} {emotion} **{score:.1f}%**"
+            for emotion, score in sorted_emotions
+        ))
         
         st.markdown("---")
         
         # 이미지 표시
-        if result['image_path'] and os.path.exists(result['image_path']):
+        if result['image_bytes']:
             st.markdown(f"### 🎨 감정 아트 ({result['style']} 스타일)")
-            st.image(result['image_path'], use_container_width=True)
+            
+            # 메모리의 PNG 바이트를 표시/다운로드에 그대로 사용
+            st.image(result['image_bytes'], use_container_width=True)
             
             # 다운로드 버튼
-            with open(result['image_path'], 'rb') as file:
-                st.download_button(
-                    label="🖼️ 이미지 다운로드",
-                    data=file,
-                    file_name=f"emotion_art_{result['main_emotion']}.png",
-                    mime="image/png",
-                    use_container_width=True
-                )
+            st.download_button(
+                label="🖼️ 이미지 다운로드",
+                data=result['image_bytes'],
+                file_name=f"emotion_art_{result['main_emotion']}.png",
+                mime="image/png",
+                use_container_width=True
+            )
         
         st.markdown("---")
         
@@ -0,0 +1,43 @@
+import os
+import sys
+import torch
+from emotion_analyzer import load_kobert_model, onnx_path_for, export_onnx
+
+def build_onnx(model_path='emotion_model_best.pth', max_length=128):
+    """
+    학습된 KoBERT 모델을 ONNX로 변환 후 INT8 동적 양자화 (CPU 배포용)
+
+    생성된 모델은 emotion_analyzer 가 CPU 환경에서 자동으로 사용
+    (없으면 첫 분석 시 자동 변환되므로, 배포 전에 미리 만들어 둘 때 사용)
+
+    Parameters:
+    - model_path: 학습된 모델 경로
+    - max_length: 더미 입력 길이 (배치/시퀀스 축은 동적)
+
+    Returns:
+    - str: 양자화된 ONNX 모델 경로
+    """
+    print("=" * 60)
+    print("KoBERT → ONNX 변환 + INT8 양자화")
+    print("=" * 60)
+
+    onnx_path = onnx_path_for(model_path)
+
+    model, loaded = load_kobert_model(model_path, torch.device('cpu'), return_loaded=True)
+    if not loaded:
+        # 기본 KoBERT 모델이 ONNX로 저장되면 CPU 추론이 경고 없이 그 모델을 사용하게 됨
+        raise RuntimeError(f"학습된 가중치를 불러오지 못해 변환을 중단합니다: {model_path}")
+    export_onnx(model, onnx_path, max_length=max_length)
+
+    size_mb = os.path.getsize(onnx_path) / 1024 / 1024
+    print(f"✓ 양자화 모델 크기: {size_mb:.1f}MB")
+
+    print("\n" + "=" * 60)
+    print("✅ 변환 완료!")
+    print("=" * 60)
+
+    return onnx_path
+
+
+if __name__ == "__main__":
+    build_onnx(*sys.argv[1:2])
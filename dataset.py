@@ -1,73 +1,219 @@
+import os
+import functools
+import numpy as np
 import torch
-from torch.utils.data import Dataset, DataLoader
+from torch.nn.utils.rnn import pad_sequence
+from torch.utils.data import Dataset, DataLoader, Sampler
 import pandas as pd
 from kobert_transformers import get_tokenizer
 
+def _save_npy_atomic(path, array):
+    """
+    임시 파일에 저장한 후 os.replace 로 교체 (중간에 끊겨도 잘린 캐시 파일이 남지 않음)
+    """
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'wb') as f:
+        np.save(f, array)
+    os.replace(tmp_path, path)
+
 class EmotionDataset(Dataset):
     """
     감정 분류 데이터셋 (6가지 감정)
     """
-    def __init__(self, csv_file, max_length=128):
-        self.data = pd.read_csv(csv_file)
+    def __init__(self, data_file, max_length=128):
+        # 전처리 결과: Parquet (없으면 CSV)
+        if data_file.endswith('.parquet'):
+            self.data = pd.read_parquet(data_file)
+        else:
+            self.data = pd.read_csv(data_file)
         self.tokenizer = get_tokenizer()
         self.max_length = max_length
         
-        print(f"  ✓ {csv_file} 로드 완료: {len(self.data):,}개")
+        # 토큰 ID를 문장별 텐서 대신 하나의 평탄한 배열 + 문장 경계(offsets)로 보관
+        # (디스크 캐시를 메모리 매핑, 패딩은 collate_batch 에서 배치별로 수행)
+        self.token_ids, self.offsets = self._load_tokens(data_file)
+        self.lengths = np.diff(self.offsets)
+        self.labels = torch.tensor(self.data['emotion'].astype(int).values, dtype=torch.long)
+        
+        print(f"  ✓ {data_file} 로드 완료: {len(self.data):,}개")
+    
+    def _load_tokens(self, data_file):
+        """
+        토큰화 결과를 디스크 캐시에서 로드 (없거나 데이터 파일보다 오래되었으면 토큰화 후 저장)
+        
+        Parameters:
+        - data_file: 전처리된 데이터 파일 경로
+        
+        Returns:
+        - (token_ids, offsets): 전체 토큰 ID (int32, 메모리 매핑), 문장 경계 (int64, 길이 N+1)
+        """
+        prefix = f'{os.path.splitext(data_file)[0]}.tokens{self.max_length}'
+        ids_path, offsets_path = f'{prefix}.ids.npy', f'{prefix}.offsets.npy'
+        
+        is_stale = not (os.path.exists(ids_path) and os.path.exists(offsets_path)) or \
+            os.path.getmtime(ids_path) < os.path.getmtime(data_file)
+        
+        if not is_stale:
+            # 문장 수/토큰 수가 맞지 않거나 읽을 수 없는 캐시도 다시 토큰화
+            try:
+                offsets = np.load(offsets_path)
+                token_ids = np.load(ids_path, mmap_mode='r')
+                is_stale = len(offsets) != len(self.data) + 1 or len(token_ids) != offsets[-1]
+            except (OSError, ValueError):
+                is_stale = True
+        
+        if is_stale:
+            # 전체 텍스트를 한 번에 토큰화 (이후 학습 실행에서는 캐시 사용)
+            encoding = self.tokenizer(
+                self.data['text'].astype(str).tolist(),
+                add_special_tokens=True,
+                max_length=self.max_length,
+                truncation=True
+            )
+            lengths = [len(ids) for ids in encoding['input_ids']]
+            offsets = np.zeros(len(lengths) + 1, dtype=np.int64)
+            np.cumsum(lengths, out=offsets[1:])
+            token_ids = np.fromiter(
+                (token for ids in encoding['input_ids'] for token in ids),
+                dtype=np.int32,
+                count=int(offsets[-1])
+            )
+            
+            # offsets 먼저 저장 (ids 파일 시각으로 최신 여부 판단)
+            _save_npy_atomic(offsets_path, offsets)
+            _save_npy_atomic(ids_path, token_ids)
+            token_ids = np.load(ids_path, mmap_mode='r')
+        
+        return token_ids, offsets
     
     def __len__(self):
         return len(self.data)
     
     def __getitem__(self, idx):
-        text = str(self.data.iloc[idx]['text'])
-        emotion = int(self.data.iloc[idx]['emotion'])
-        
-        encoding = self.tokenizer.encode_plus(
-            text,
-            add_special_tokens=True,
-            max_length=self.max_length,
-            padding='max_length',
-            truncation=True,
-            return_tensors='pt'
-        )
+        start, end = self.offsets[idx], self.offsets[idx + 1]
+        input_ids = torch.from_numpy(self.token_ids[start:end].astype(np.int64))
         
         return {
-            'input_ids': encoding['input_ids'].flatten(),
-            'attention_mask': encoding['attention_mask'].flatten(),
-            'label': torch.tensor(emotion, dtype=torch.long)
+            'input_ids': input_ids,
+            # 패딩 전 문장은 모든 토큰이 유효 (패딩 마스크는 collate_batch 에서 0으로)
+            'attention_mask': torch.ones_like(input_ids),
+            'label': self.labels[idx]
         }
 
 
-def create_data_loaders(batch_size=16):
+class LengthGroupedBatchSampler(Sampler):
+    """
+    길이가 비슷한 문장끼리 배치로 묶는 샘플러 (동적 패딩 시 패딩 토큰 최소화)
+    
+    매 에포크: 전체를 섞고 batch_size × mega_batch_factor 개씩 나눠 그 안에서 길이순 정렬
+    → batch_size 단위로 자른 뒤 배치 순서를 다시 섞음 (무작위성 유지)
+    """
+    def __init__(self, lengths, batch_size, mega_batch_factor=50):
+        self.lengths = torch.as_tensor(lengths)
+        self.batch_size = batch_size
+        self.mega_batch_size = batch_size * mega_batch_factor
+    
+    def __len__(self):
+        return (len(self.lengths) + self.batch_size - 1) // self.batch_size
+    
+    def __iter__(self):
+        indices = torch.randperm(len(self.lengths))
+        
+        batches = []
+        for start in range(0, len(indices), self.mega_batch_size):
+            chunk = indices[start:start + self.mega_batch_size]
+            chunk = chunk[torch.argsort(self.lengths[chunk], descending=True)].tolist()
+            batches.extend(
+                chunk[i:i + self.batch_size]
+                for i in range(0, len(chunk), self.batch_size)
+            )
+        
+        for b in torch.randperm(len(batches)).tolist():
+            yield batches[b]
+
+
+def collate_batch(batch, pad_token_id=0):
+    """
+    배치 내 가장 긴 문장 길이에 맞춰 패딩 (동적 패딩)
+    """
+    return {
+        'input_ids': pad_sequence(
+            [item['input_ids'] for item in batch],
+            batch_first=True,
+            padding_value=pad_token_id
+        ),
+        'attention_mask': pad_sequence(
+            [item['attention_mask'] for item in batch],
+            batch_first=True,
+            padding_value=0
+        ),
+        'label': torch.stack([item['label'] for item in batch])
+    }
+
+
+def _split_path(split):
+    """
+    전처리된 분할 파일 경로 (Parquet 우선, 예전 CSV 출력도 지원)
+    """
+    parquet_path = f'data/{split}.parquet'
+    return parquet_path if os.path.exists(parquet_path) else f'data/{split}.csv'
+
+
+def create_data_loaders(batch_size=16, num_workers=None):
     """
     학습/검증/테스트 데이터 로더 생성
+    
+    Parameters:
+    - batch_size: 배치 크기
+    - num_workers: 데이터 로딩 프로세스 수 (기본: CPU 코어 수의 절반)
     """
     print("\n데이터 로더 생성 중...")
     
-    train_dataset = EmotionDataset('data/train.csv')
-    val_dataset = EmotionDataset('data/val.csv')
-    test_dataset = EmotionDataset('data/test.csv')
+    train_dataset = EmotionDataset(_split_path('train'))
+    val_dataset = EmotionDataset(_split_path('val'))
+    test_dataset = EmotionDataset(_split_path('test'))
+    
+    if num_workers is None:
+        num_workers = (os.cpu_count() or 2) // 2
+    
+    # 멀티프로세스 로딩 + 고정 메모리 (GPU 비동기 복사)
+    loader_kwargs = {
+        'collate_fn': functools.partial(
+            collate_batch,
+            pad_token_id=train_dataset.tokenizer.pad_token_id
+        ),
+        'num_workers': num_workers,
+        'pin_memory': torch.cuda.is_available()
+    }
+    if num_workers > 0:
+        loader_kwargs['persistent_workers'] = True
+        loader_kwargs['prefetch_factor'] = 4
     
+    # 학습: 길이가 비슷한 문장끼리 배치 (배치 순서는 매 에포크 무작위)
     train_loader = DataLoader(
         train_dataset, 
-        batch_size=batch_size, 
-        shuffle=True
+        batch_sampler=LengthGroupedBatchSampler(train_dataset.lengths, batch_size),
+        **loader_kwargs
     )
     
     val_loader = DataLoader(
         val_dataset, 
-        batch_size=batch_size, 
-        shuffle=False
+        batch_size=batch_size,
+        shuffle=False,
+        **loader_kwargs
     )
     
     test_loader = DataLoader(
         test_dataset, 
-        batch_size=batch_size, 
-        shuffle=False
+        batch_size=batch_size,
+        shuffle=False,
+        **loader_kwargs
     )
     
     print(f"✓ 학습 배치: {len(train_loader):,}개")
     print(f"✓ 검증 배치: {len(val_loader):,}개")
     print(f"✓ 테스트 배치: {len(test_loader):,}개")
+    print(f"✓ 로딩 워커: {num_workers}개")
     
     return train_loader, val_loader, test_loader
 
@@ -1,201 +1,550 @@
 import torch
 from transformers import BertForSequenceClassification, AutoTokenizer
-import numpy as np
+from transformers.modeling_outputs import SequenceClassifierOutput
+import functools
+import inspect
+import threading
+import os
+import pickle
 import re
 
+# ONNX Runtime (선택) - build_onnx.py 로 만든 모델이 있으면 CPU 추론에 사용
+try:
+    import onnxruntime as ort
+except ImportError:
+    ort = None
+
 # 감정 레이블
 EMOTION_LABELS = ['분노', '슬픔', '불안', '상처', '당황', '기쁨']
 
+# 문장 = (종결 부호 앞 텍스트 + 종결 부호 + 공백) 또는 부호 없는 마지막 텍스트
+_SENTENCE_RE = re.compile(r'[^.!?]*[.!?]+\s*|[^.!?]+')
+_SENTENCE_END = frozenset('.!?')
+
+# 한 번에 추론할 최대 문장 수 (길이순 정렬 후 이 단위로 나눠 패딩)
+INFERENCE_BATCH_SIZE = 32
+
+# 모델 캐시 동시 로드 방지 (Streamlit 세션은 스레드로 실행됨)
+_MODEL_LOCK = threading.Lock()
+
+
+class EmotionAnalysisError(RuntimeError):
+    """
+    감정 분석 실패 (모델 로드/추론 오류)
+    
+    결과를 캐시하는 호출자가 실패 시의 균등 분포를 실제 결과로 저장하지 않도록 구분
+    """
+
+
+def uniform_emotions():
+    """
+    분석 실패 시 사용하는 균등 분포
+    """
+    return {label: 100.0/6 for label in EMOTION_LABELS}
+
+
 def split_sentences(text):
     """
     텍스트를 문장 단위로 분리 (개선된 한국어 분리)
     """
     text = text.strip()
     
-    # 문장 종결 부호로 분리
-    sentences = re.split(r'([.!?]+[\s]*)', text)
+    # 종결 부호가 없으면 한 문장
+    if _SENTENCE_END.isdisjoint(text):
+        return [text]
     
-    # 분리된 구분자와 문장 재결합
-    result = []
-    for i in range(0, len(sentences) - 1, 2):
-        sentence = (sentences[i] + sentences[i + 1]).strip()
-        if sentence and len(sentence) > 2:  # 너무 짧은 문장 제외
-            result.append(sentence)
-    
-    # 마지막 문장 (구분자 없을 수 있음)
-    if len(sentences) % 2 == 1 and sentences[-1].strip():
-        if len(sentences[-1].strip()) > 2:
-            result.append(sentences[-1].strip())
+    # 문장 종결 부호까지를 한 문장으로 스캔 (너무 짧은 문장 제외)
+    result = [
+        sentence
+        for sentence in (m.group(0).strip() for m in _SENTENCE_RE.finditer(text))
+        if len(sentence) > 2
+    ]
     
     # 문장이 없으면 원본 텍스트 반환
-    if not result:
-        result = [text]
-    
-    return result
+    return result or [text]
 
 
-def analyze_emotion_with_model(text, model_path='emotion_model_best.pth'):
+def onnx_path_for(model_path):
     """
-    감정 분석 (Weighted 방식 - 문장 길이 가중 평균)
+    학습된 가중치 경로에 대응하는 ONNX 모델 경로
+    (emotion_model_best.pth → emotion_model_best.onnx)
+    """
+    return os.path.splitext(model_path)[0] + '.onnx'
+
+
+def load_kobert_model(model_path, device, return_loaded=False):
+    """
+    KoBERT 분류 모델 생성 + 학습된 가중치 로드 (FP32, eval 모드)
+    
+    가중치 로드에 실패하면 기본 KoBERT 모델로 대신 분석 (경고만 출력)
     
     Parameters:
-    - text: 분석할 텍스트
     - model_path: 학습된 모델 경로
+    - device: 모델을 올릴 장치
+    - return_loaded: True면 학습된 가중치 로드 여부도 함께 반환
+      (ONNX 변환처럼 결과를 파일로 남기는 호출자는 기본 모델을 저장하지 않도록 확인)
     
     Returns:
-    - dict: {'분노': 10.5, '슬픔': 20.3, ...}
+    - model 또는 (model, loaded)
     """
-    print(f"\n{'='*60}")
-    print("🔍 감정 분석 시작 (Weighted 방식)")
-    print(f"{'='*60}")
+    print("📦 KoBERT 모델 로드 중...")
+    model = BertForSequenceClassification.from_pretrained(
+        'monologg/kobert',
+        num_labels=6,
+        trust_remote_code=True  # ✅ 필수!
+    )
+    print("✓ 기본 모델 로드 완료")
     
-    # 디바이스 설정
-    device = torch.device('cuda' if torch.cuda.is_available() else 'cpu')
-    print(f"📱 디바이스: {device}")
+    # 학습된 가중치 로드
+    loaded = False
+    try:
+        # mmap: 필요한 페이지만 읽음 / weights_only: 안전한 역직렬화
+        checkpoint = torch.load(model_path, map_location=device, mmap=True, weights_only=True)
+        if 'model_state_dict' in checkpoint:
+            model.load_state_dict(checkpoint['model_state_dict'])
+        else:
+            model.load_state_dict(checkpoint)
+        loaded = True
+        print(f"✓ 학습된 가중치 로드 완료: {model_path}")
+    except FileNotFoundError:
+        print(f"⚠️  학습된 가중치 파일 없음: {model_path}")
+        print("⚠️  기본 KoBERT 모델로 분석합니다 (정확도 낮을 수 있음)")
+    except pickle.UnpicklingError as e:
+        # weights_only=True: 텐서 외의 객체를 pickle한 체크포인트는 거부됨
+        print(f"⚠️  가중치 거부됨 (weights_only 로드 불가 객체 포함): {e}")
+        print("⚠️  기본 KoBERT 모델로 분석합니다")
+    except RuntimeError as e:
+        # 구 형식/손상된 파일(LFS 포인터 등) 또는 모델과 맞지 않는 키
+        print(f"⚠️  가중치 거부됨 (형식 또는 키 불일치): {e}")
+        print("⚠️  기본 KoBERT 모델로 분석합니다")
+    
+    model.to(device)
+    model.eval()
     
-    # KoBERT 모델 로드
+    if return_loaded:
+        return model, loaded
+    return model
+
+
+def export_onnx(model, onnx_path, max_length=128):
+    """
+    KoBERT 모델을 ONNX로 변환 후 INT8 동적 양자화 (CPU 추론용)
+    
+    Parameters:
+    - model: FP32 KoBERT 모델 (CPU, eval 모드)
+    - onnx_path: 저장할 ONNX 모델 경로
+    - max_length: 더미 입력 길이 (배치/시퀀스 축은 동적)
+    """
+    # 양자화 도구는 변환 시에만 필요
+    from onnxruntime.quantization import quantize_dynamic, QuantType
+    
+    fp32_path = os.path.splitext(onnx_path)[0] + '_fp32.onnx'
+    tmp_path = onnx_path + '.tmp'
+    
+    # 더미 입력으로 추적 (배치, 시퀀스 길이는 동적 축)
+    input_ids = torch.ones(1, max_length, dtype=torch.long)
+    attention_mask = torch.ones(1, max_length, dtype=torch.long)
+    
+    # PyTorch 2.5+ 는 dynamo 옵션이 있으므로 dynamic_axes 기반 TorchScript 내보내기를 명시
+    # (그 이전 버전은 인자 자체가 없고 TorchScript 내보내기가 기본)
+    export_kwargs = {}
+    if 'dynamo' in inspect.signature(torch.onnx.export).parameters:
+        export_kwargs['dynamo'] = False
+    
+    print("🔄 ONNX 변환 중...")
     try:
-        print("📦 KoBERT 모델 로드 중...")
-        model = BertForSequenceClassification.from_pretrained(
-            'monologg/kobert',
-            num_labels=6,
-            trust_remote_code=True  # ✅ 필수!
+        torch.onnx.export(
+            model,
+            (input_ids, attention_mask),
+            fp32_path,
+            input_names=['input_ids', 'attention_mask'],
+            output_names=['logits'],
+            dynamic_axes={
+                'input_ids': {0: 'batch', 1: 'sequence'},
+                'attention_mask': {0: 'batch', 1: 'sequence'},
+                'logits': {0: 'batch'}
+            },
+            opset_version=17,
+            **export_kwargs
         )
-        print("✓ 기본 모델 로드 완료")
         
-        # 학습된 가중치 로드
-        try:
-            checkpoint = torch.load(model_path, map_location=device, weights_only=False)
-            if 'model_state_dict' in checkpoint:
-                model.load_state_dict(checkpoint['model_state_dict'])
+        print("🔢 INT8 동적 양자화 중...")
+        quantize_dynamic(fp32_path, tmp_path, weight_type=QuantType.QInt8)
+        
+        # 완성된 파일만 최종 경로에 노출 (중단 시 깨진 모델 방지)
+        os.replace(tmp_path, onnx_path)
+    finally:
+        for path in (fp32_path, tmp_path):
+            if os.path.exists(path):
+                os.remove(path)
+    
+    print(f"✓ ONNX 모델 저장: {onnx_path}")
+
+
+def _onnx_is_stale(model_path, onnx_path):
+    """
+    학습된 가중치가 있는데 ONNX 모델이 없거나 그보다 오래되었는지 확인
+    """
+    if not os.path.exists(model_path):
+        return False
+    if not os.path.exists(onnx_path):
+        return True
+    return os.path.getmtime(onnx_path) < os.path.getmtime(model_path)
+
+
+class _OrtModel:
+    """
+    ONNX Runtime 세션을 KoBERT 모델처럼 호출하기 위한 래퍼
+    (model(**inputs).logits 형태 그대로 사용)
+    """
+    def __init__(self, onnx_path):
+        options = ort.SessionOptions()
+        options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+        self.session = ort.InferenceSession(
+            onnx_path,
+            sess_options=options,
+            providers=['CPUExecutionProvider']
+        )
+    
+    def __call__(self, input_ids, attention_mask, **kwargs):
+        logits = self.session.run(
+            ['logits'],
+            {
+                'input_ids': input_ids.numpy(),
+                'attention_mask': attention_mask.numpy()
+            }
+        )[0]
+        return SequenceClassifierOutput(logits=torch.from_numpy(logits))
+
+
+def _compile_model(model, device):
+    """
+    torch.compile 로 커널 융합 (GPU 전용, 실패 시 원본 모델 사용)
+    
+    문장 수/길이가 매번 달라지므로 dynamic shape로 컴파일
+    (고정 shape CUDA Graph는 _CudaGraphRunner 가 원본 모델로 따로 캡처)
+    """
+    try:
+        compiled = torch.compile(model, dynamic=True)
+        
+        # 컴파일은 첫 호출 시 일어나므로 로드 시점에 미리 실행
+        dummy = torch.ones(1, 8, dtype=torch.long, device=device)
+        with torch.inference_mode():
+            compiled(input_ids=dummy, attention_mask=dummy)
+        print("✓ torch.compile 완료")
+        return compiled
+    except Exception as e:
+        print(f"⚠️  torch.compile 실패, eager 모드 사용: {e}")
+        return model
+
+
+def _quantize_model(model):
+    """
+    CPU용 INT8 동적 양자화 (nn.Linear 가중치만, 실패 시 원본 FP32 모델 사용)
+    
+    임베딩/LayerNorm은 FP32 유지, 활성값은 호출 시점에 동적으로 양자화
+    """
+    try:
+        model = torch.ao.quantization.quantize_dynamic(
+            model,
+            {torch.nn.Linear},
+            dtype=torch.qint8
+        )
+        print("✓ INT8 동적 양자화 완료")
+    except Exception as e:
+        print(f"⚠️  INT8 양자화 실패, FP32 모델 사용: {e}")
+    
+    return model
+
+
+@functools.lru_cache(maxsize=2)
+def _load_model(model_path, device):
+    """
+    KoBERT 모델을 한 번만 로드 (model_path, device 별 캐시, 토크나이저는 공유)
+    
+    Returns:
+    - (model, tokenizer)
+    """
+    onnx_path = onnx_path_for(model_path)
+    model = None
+    torch_model = None
+    
+    if device.type == 'cpu' and ort is not None:
+        # CPU: ONNX Runtime (INT8 양자화 + 그래프 최적화)
+        # ONNX 모델이 없거나 가중치보다 오래되었으면 최초 1회 자동 변환
+        export_ok = True
+        if _onnx_is_stale(model_path, onnx_path):
+            torch_model, loaded = load_kobert_model(model_path, device, return_loaded=True)
+            if not loaded:
+                # 기본 모델을 ONNX로 저장하면 이후 프로세스가 경고 없이 계속 사용하게 됨
+                print("⚠️  학습된 가중치를 불러오지 못해 ONNX 변환 생략, PyTorch 모델 사용")
+                export_ok = False
             else:
-                model.load_state_dict(checkpoint)
-            print(f"✓ 학습된 가중치 로드 완료: {model_path}")
-        except FileNotFoundError:
-            print(f"⚠️  학습된 가중치 파일 없음: {model_path}")
-            print("⚠️  기본 KoBERT 모델로 분석합니다 (정확도 낮을 수 있음)")
-        except Exception as e:
-            print(f"⚠️  가중치 로드 실패: {e}")
-            print("⚠️  기본 KoBERT 모델로 분석합니다")
+                try:
+                    export_onnx(torch_model, onnx_path)
+                except Exception as e:
+                    print(f"⚠️  ONNX 변환 실패, PyTorch 모델 사용: {e}")
+                    export_ok = False
+        
+        if export_ok and os.path.exists(onnx_path):
+            model = _OrtModel(onnx_path)
+            print(f"✓ ONNX 모델 로드 완료: {onnx_path}")
+    
+    if model is None:
+        model = torch_model if torch_model is not None else load_kobert_model(model_path, device)
         
-        model.to(device)
-        model.eval()
+        if device.type == 'cuda':
+            # GPU에서는 FP16 추론 (Tensor Core 사용, 메모리 대역폭 절반)
+            model.half()
+            model = _compile_model(model, device)
+        else:
+            # CPU (ONNX Runtime 미사용): Linear 가중치 INT8 동적 양자화
+            model = _quantize_model(model)
+    
+    return model, _get_tokenizer()
+
+
+@functools.lru_cache(maxsize=1)
+def _get_tokenizer():
+    """
+    KoBERT 토크나이저를 프로세스당 한 번만 로드 (모델 경로/디바이스와 무관하게 공유)
+    """
+    print("📝 토크나이저 로드 중...")
+    # use_fast: Rust 토크나이저 (배치 토큰화 병렬 처리), 없으면 느린 버전으로 대체됨
+    tokenizer = AutoTokenizer.from_pretrained(
+        'monologg/kobert',
+        use_fast=True,
+        trust_remote_code=True  # ✅ 필수!
+    )
+    print("✓ 토크나이저 로드 완료")
+    
+    return tokenizer
+
+
+class _CudaGraphRunner:
+    """
+    고정 shape (1, max_length) KoBERT 순전파를 CUDA Graph로 캡처 후 재실행
+    (문장 하나당 수백 개의 커널 런치 오버헤드 제거 - analyze_emotion_simple 전용)
+    """
+    def __init__(self, model, device, max_length=128):
+        self.lock = threading.Lock()
+        self.static_ids = torch.zeros(1, max_length, dtype=torch.long, device=device)
+        self.static_mask = torch.ones(1, max_length, dtype=torch.long, device=device)
         
+        with torch.inference_mode():
+            # 워밍업은 별도 스트림에서 (cuBLAS 핸들 / 메모리 풀 초기화)
+            stream = torch.cuda.Stream()
+            stream.wait_stream(torch.cuda.current_stream())
+            with torch.cuda.stream(stream):
+                for _ in range(3):
+                    model(input_ids=self.static_ids, attention_mask=self.static_mask)
+            torch.cuda.current_stream().wait_stream(stream)
+            
+            self.graph = torch.cuda.CUDAGraph()
+            with torch.cuda.graph(self.graph):
+                self.static_logits = model(
+                    input_ids=self.static_ids,
+                    attention_mask=self.static_mask
+                ).logits
+    
+    def __call__(self, input_ids, attention_mask, **kwargs):
+        # 정적 버퍼를 공유하므로 재실행 + 결과 복사는 한 번에 하나씩
+        with self.lock:
+            self.static_ids.copy_(input_ids)
+            self.static_mask.copy_(attention_mask)
+            self.graph.replay()
+            logits = self.static_logits.clone()
+        return SequenceClassifierOutput(logits=logits)
+
+
+@functools.lru_cache(maxsize=2)
+def _load_cuda_graph(model_path, device):
+    """
+    캐시된 모델의 CUDA Graph 캡처 (실패 시 None → 일반 순전파 사용)
+    """
+    model, _ = _load_model(model_path, device)
+    model = getattr(model, '_orig_mod', model)  # torch.compile 이전 원본 모듈
+    
+    try:
+        runner = _CudaGraphRunner(model, device)
+        print("✓ CUDA Graph 캡처 완료")
+        return runner
+    except Exception as e:
+        print(f"⚠️  CUDA Graph 캡처 실패, 일반 추론 사용: {e}")
+        return None
+
+
+def _to_device(inputs, device):
+    """
+    토큰화 결과를 디바이스로 복사
+    (GPU: 고정 메모리 + 비동기 복사로 CPU 대기 없이 큐에 등록)
+    """
+    if device.type == 'cuda':
+        return {
+            key: val.pin_memory().to(device, non_blocking=True)
+            for key, val in inputs.items()
+        }
+    return {key: val.to(device) for key, val in inputs.items()}
+
+
+def _get_model(model_path, device):
+    """
+    캐시된 (model, tokenizer) 반환 - 최초 호출 시에만 디스크에서 로드
+    """
+    with _MODEL_LOCK:
+        return _load_model(model_path, device)
+
+
+def preload_model(model_path='emotion_model_best.pth'):
+    """
+    모델 캐시 미리 채우기 (앱 시작 시 호출 → 첫 분석 요청의 로드 지연 제거)
+    
+    Returns:
+    - bool: 로드 성공 여부
+    """
+    device = torch.device('cuda' if torch.cuda.is_available() else 'cpu')
+    
+    try:
+        _get_model(model_path, device)
+        return True
     except Exception as e:
         print(f"❌ 모델 로드 실패: {e}")
-        # 오류 시 균등 분포 반환
-        return {label: 100.0/6 for label in EMOTION_LABELS}
+        return False
+
+
+def analyze_emotion_with_model(text, model_path='emotion_model_best.pth', verbose=False, fallback=True):
+    """
+    감정 분석 (Weighted 방식 - 문장 길이 가중 평균)
+    
+    Parameters:
+    - text: 분석할 텍스트
+    - model_path: 학습된 모델 경로
+    - verbose: 문장별 분석 과정 출력 여부
+    - fallback: True면 실패 시 균등 분포 반환, False면 EmotionAnalysisError 발생
+      (결과를 캐시하는 호출자는 False로 호출해 실패 결과가 캐시되지 않도록)
     
-    # 토크나이저 로드
+    Returns:
+    - dict: {'분노': 10.5, '슬픔': 20.3, ...}
+    """
+    if verbose:
+        print(f"\n{'='*60}")
+        print("🔍 감정 분석 시작 (Weighted 방식)")
+        print(f"{'='*60}")
+    
+    # 디바이스 설정
+    device = torch.device('cuda' if torch.cuda.is_available() else 'cpu')
+    if verbose:
+        print(f"📱 디바이스: {device}")
+    
+    # KoBERT 모델 + 토크나이저 (캐시)
     try:
-        print("📝 토크나이저 로드 중...")
-        tokenizer = AutoTokenizer.from_pretrained(
-            'monologg/kobert',
-            trust_remote_code=True  # ✅ 필수!
-        )
-        print("✓ 토크나이저 로드 완료")
+        model, tokenizer = _get_model(model_path, device)
     except Exception as e:
-        print(f"❌ 토크나이저 로드 실패: {e}")
-        return {label: 100.0/6 for label in EMOTION_LABELS}
+        print(f"❌ 모델 로드 실패: {e}")
+        if not fallback:
+            raise EmotionAnalysisError(f"모델 로드 실패: {e}") from e
+        # 오류 시 균등 분포 반환
+        return uniform_emotions()
     
     # 텍스트를 문장으로 분리
     sentences = split_sentences(text)
-    print(f"\n📝 분석할 문장 개수: {len(sentences)}")
+    if verbose:
+        print(f"\n📝 분석할 문장 개수: {len(sentences)}")
     
-    # 문장별 감정 분석
-    sentence_emotions = []
-    sentence_lengths = []
+    # 빈 문장 제외
+    sentences = [s for s in sentences if s.strip()]
     
-    for i, sentence in enumerate(sentences, 1):
-        if not sentence.strip():
-            continue
-        
-        print(f"\n[문장 {i}/{len(sentences)}] {sentence[:50]}{'...' if len(sentence) > 50 else ''}")
+    # 문장을 길이순으로 정렬 → 비슷한 길이끼리 배치 추론 (배치 내 가장 긴 문장 길이로 패딩)
+    order = sorted(range(len(sentences)), key=lambda i: len(sentences[i]))
+    
+    try:
+        batch_probs = []
         
-        # 토큰화
-        try:
+        for start in range(0, len(order), INFERENCE_BATCH_SIZE):
+            batch = [sentences[i] for i in order[start:start + INFERENCE_BATCH_SIZE]]
             inputs = tokenizer(
-                sentence,
+                batch,
                 return_tensors='pt',
                 max_length=128,
-                padding='max_length',
+                padding=True,
                 truncation=True
             )
-            inputs = {key: val.to(device) for key, val in inputs.items()}
+            inputs = _to_device(inputs, device)
             
-            # 예측
-            with torch.no_grad():
+            with torch.inference_mode():
                 outputs = model(**inputs)
-                logits = outputs.logits
-                probs = torch.softmax(logits, dim=1)[0]
-                probs = probs.cpu().numpy()
-            
-            # 문장별 감정 저장
-            sentence_emotion = {
-                label: float(prob * 100) 
-                for label, prob in zip(EMOTION_LABELS, probs)
-            }
-            
-            sentence_emotions.append(sentence_emotion)
-            sentence_lengths.append(len(sentence))
+                # softmax는 FP32로 계산 (FP16 수치 손실 방지)
+                batch_probs.append(torch.softmax(outputs.logits.float(), dim=1))
+        
+        # 원래 문장 순서로 복원 (문장 수, 6)
+        probs = torch.cat(batch_probs)
+        probs = probs[torch.tensor(order, device=probs.device).argsort()]
+    except Exception as e:
+        print(f"   ⚠️ 문장 분석 실패: {e}")
+        probs = None
+        error = e
+    else:
+        error = None
+    
+    if verbose and probs is not None:
+        total_chars = sum(map(len, sentences))
+        for i, (sentence, sentence_probs) in enumerate(zip(sentences, probs.cpu().numpy()), 1):
+            print(f"\n[문장 {i}/{len(sentences)}] {sentence[:50]}{'...' if len(sentence) > 50 else ''}")
             
             # 문장별 결과 출력
-            sorted_emotions = sorted(
-                sentence_emotion.items(), 
-                key=lambda x: x[1], 
-                reverse=True
-            )
-            print(f"   주요 감정: {sorted_emotions[0][0]} ({sorted_emotions[0][1]:.1f}%)")
-            print(f"   문장 길이: {len(sentence)}자 (가중치: {len(sentence)/sum([len(s) for s in sentences]):.2%})")
-            
-        except Exception as e:
-            print(f"   ⚠️ 문장 분석 실패: {e}")
-            continue
+            top = int(sentence_probs.argmax())
+            print(f"   주요 감정: {EMOTION_LABELS[top]} ({sentence_probs[top] * 100:.1f}%)")
+            print(f"   문장 길이: {len(sentence)}자 (가중치: {len(sentence)/total_chars:.2%})")
     
     # 분석 실패 시
-    if not sentence_emotions:
+    if probs is None or len(probs) == 0:
         print("\n❌ 모든 문장 분석 실패")
-        return {label: 100.0/6 for label in EMOTION_LABELS}
+        if not fallback:
+            raise EmotionAnalysisError("모든 문장 분석 실패") from error
+        return uniform_emotions()
     
     # ✅ Weighted 방식: 문장 길이 기반 가중 평균
-    print(f"\n{'='*60}")
-    print("⚖️  가중 평균 계산 중...")
-    print(f"{'='*60}")
-    
-    final_emotions = {label: 0.0 for label in EMOTION_LABELS}
-    total_length = sum(sentence_lengths)
+    # 가중 평균은 디바이스에서 계산 → 최종 6개 값만 CPU로 복사
+    sentence_lengths = torch.tensor(
+        [len(s) for s in sentences],
+        dtype=probs.dtype,
+        device=probs.device
+    )
+    weights = sentence_lengths / sentence_lengths.sum()
     
-    for i, (sent_emotion, length) in enumerate(zip(sentence_emotions, sentence_lengths), 1):
-        weight = length / total_length
-        print(f"문장 {i}: 길이 {length}자 → 가중치 {weight:.2%}")
+    if verbose:
+        print(f"\n{'='*60}")
+        print("⚖️  가중 평균 계산 중...")
+        print(f"{'='*60}")
         
-        for label in EMOTION_LABELS:
-            final_emotions[label] += sent_emotion[label] * weight
+        for i, (length, weight) in enumerate(zip(sentence_lengths.tolist(), weights.tolist()), 1):
+            print(f"문장 {i}: 길이 {int(length)}자 → 가중치 {weight:.2%}")
     
-    # 정규화 (합이 100%가 되도록)
-    total = sum(final_emotions.values())
-    if total > 0:
-        final_emotions = {
-            label: (score / total) * 100 
-            for label, score in final_emotions.items()
-        }
+    # (6, N) @ (N,) → 감정별 가중 평균
+    scores = probs.T @ weights
     
-    # 최종 결과 출력
-    print(f"\n{'='*60}")
-    print("✨ 최종 감정 분석 결과 (Weighted)")
-    print(f"{'='*60}")
-    
-    sorted_final = sorted(
-        final_emotions.items(), 
-        key=lambda x: x[1], 
-        reverse=True
-    )
+    # 정규화 (합이 100%가 되도록)
+    scores = scores / scores.sum().clamp_min(1e-12) * 100
     
-    for i, (emotion, score) in enumerate(sorted_final, 1):
-        bar = "█" * int(score / 3)
-        print(f"{i}. {emotion:6s}: {score:5.1f}% {bar}")
+    final_emotions = dict(zip(EMOTION_LABELS, scores.tolist()))
     
-    print(f"{'='*60}\n")
+    # 최종 결과 출력
+    if verbose:
+        print(f"\n{'='*60}")
+        print("✨ 최종 감정 분석 결과 (Weighted)")
+        print(f"{'='*60}")
+        
+        sorted_final = sorted(
+            final_emotions.items(), 
+            key=lambda x: x[1], 
+            reverse=True
+        )
+        
+        for i, (emotion, score) in enumerate(sorted_final, 1):
+            bar = "█" * int(score / 3)
+            print(f"{i}. {emotion:6s}: {score:5.1f}% {bar}")
+        
+        print(f"{'='*60}\n")
     
     return final_emotions
 
@@ -214,61 +563,40 @@ def analyze_emotion_simple(text, model_path='emotion_model_best.pth'):
     """
     device = torch.device('cuda' if torch.cuda.is_available() else 'cpu')
     
-    # 모델 로드
+    # 모델 + 토크나이저 (캐시)
     try:
-        model = BertForSequenceClassification.from_pretrained(
-            'monologg/kobert',
-            num_labels=6,
-            trust_remote_code=True
-        )
-        
-        # 학습된 가중치 로드
-        try:
-            checkpoint = torch.load(model_path, map_location=device, weights_only=False)
-            model.load_state_dict(checkpoint.get('model_state_dict', checkpoint))
-        except:
-            pass
-        
-        model.to(device)
-        model.eval()
-        
+        model, tokenizer = _get_model(model_path, device)
     except Exception as e:
         print(f"❌ 모델 로드 실패: {e}")
-        return {label: 100.0/6 for label in EMOTION_LABELS}
+        return uniform_emotions()
     
-    # 토크나이저
-    try:
-        tokenizer = AutoTokenizer.from_pretrained(
-            'monologg/kobert',
-            trust_remote_code=True
-        )
-    except Exception as e:
-        print(f"❌ 토크나이저 로드 실패: {e}")
-        return {label: 100.0/6 for label in EMOTION_LABELS}
+    # GPU: 고정 shape CUDA Graph 재실행 (캡처는 최초 1회)
+    graph_runner = None
+    if device.type == 'cuda':
+        with _MODEL_LOCK:
+            graph_runner = _load_cuda_graph(model_path, device)
     
     # 토큰화 및 예측
+    # (CUDA Graph는 (1, 128) 고정 → 128로 패딩, 그 외에는 패딩 없이 실제 길이만큼만 계산)
     try:
         inputs = tokenizer(
             text,
             return_tensors='pt',
             max_length=128,
-            padding='max_length',
+            padding='max_length' if graph_runner else False,
             truncation=True
         )
-        inputs = {key: val.to(device) for key, val in inputs.items()}
+        inputs = _to_device(inputs, device)
         
-        with torch.no_grad():
-            outputs = model(**inputs)
-            probs = torch.softmax(outputs.logits, dim=1)[0]
-            probs = probs.cpu().numpy()
+        with torch.inference_mode():
+            outputs = (graph_runner or model)(**inputs)
+            # softmax는 디바이스에서 FP32로 → 최종 6개 값만 CPU로 복사
+            probs = torch.softmax(outputs.logits.float(), dim=1)[0] * 100
         
-        emotions = {
-            label: float(prob * 100) 
-            for label, prob in zip(EMOTION_LABELS, probs)
-        }
+        emotions = dict(zip(EMOTION_LABELS, probs.tolist()))
         
         return emotions
         
     except Exception as e:
         print(f"❌ 분석 실패: {e}")
-        return {label: 100.0/6 for label in EMOTION_LABELS}
\ No newline at end of file
+        return uniform_emotions()
\ No newline at end of file
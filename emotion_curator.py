@@ -1,4 +1,5 @@
-from emotion_analyzer import analyze_emotion_with_model
+from collections import OrderedDict
+from emotion_analyzer import analyze_emotion_with_model, preload_model, EmotionAnalysisError, uniform_emotions
 from image_generator import ImageGenerator
 from music_recommender import MusicRecommender
 
@@ -9,6 +10,10 @@ class EmotionCurator:
         print("=" * 60)
         
         self.model_path = model_path
+        
+        # 감정 분석 결과 LRU 캐시 (같은 텍스트는 모델을 다시 실행하지 않음)
+        self.emotion_cache = OrderedDict()
+        self.emotion_cache_size = 128
         self.image_generator = ImageGenerator()
         
         try:
@@ -18,32 +23,57 @@ class EmotionCurator:
             print(f"⚠️  음악 추천기 초기화 실패: {e}")
             self.music_recommender = None
         
-        print("✓ 감정 분석 모델 준비 완료")
+        # 모델 캐시 미리 채우기 (첫 curate() 호출의 로드 지연 제거)
+        if preload_model(self.model_path):
+            print("✓ 감정 분석 모델 준비 완료")
         print("✓ 그라데이션 이미지 생성기 준비 완료")
         print()
     
-    def curate(self, text, generate_image=True, recommend_music=True, num_tracks=5):
-        print("=" * 60)
-        print("🎭 감정 큐레이션 시작")
-        print("=" * 60)
+    def _analyze(self, text, verbose):
+        """
+        캐시된 감정 분석 결과 반환 (없으면 분석 후 캐시에 저장)
         
-        # 1. 감정 분석
-        print(f"\n📝 입력: {text}")
-        print("\n🔍 감정 분석 중...")
+        분석 실패 시 균등 분포를 반환하되 캐시에는 넣지 않음 (다음 호출에서 다시 분석)
+        """
+        if text in self.emotion_cache:
+            self.emotion_cache.move_to_end(text)
+            return dict(self.emotion_cache[text])
+        
+        try:
+            emotions = analyze_emotion_with_model(text, self.model_path, verbose=verbose, fallback=False)
+        except EmotionAnalysisError:
+            return uniform_emotions()
         
-        emotions = analyze_emotion_with_model(text, self.model_path)
+        self.emotion_cache[text] = emotions
+        if len(self.emotion_cache) > self.emotion_cache_size:
+            self.emotion_cache.popitem(last=False)
+        
+        return dict(emotions)
+    
+    def curate(self, text, generate_image=True, recommend_music=True, num_tracks=5, verbose=True):
+        if verbose:
+            print("=" * 60)
+            print("🎭 감정 큐레이션 시작")
+            print("=" * 60)
+            
+            print(f"\n📝 입력: {text}")
+            print("\n🔍 감정 분석 중...")
+        
+        # 1. 감정 분석
+        emotions = self._analyze(text, verbose)
         
         # 주요 감정
         main_emotion = max(emotions.items(), key=lambda x: x[1])
         emotion_name = main_emotion[0]
         emotion_score = main_emotion[1]
         
-        print(f"\n✨ 주요 감정: {emotion_name} ({emotion_score:.1f}%)")
-        print("\n📊 감정 분포:")
-        sorted_emotions = sorted(emotions.items(), key=lambda x: x[1], reverse=True)
-        for emotion, score in sorted_emotions:
-            bar = "█" * int(score / 5)
-            print(f"  {emotion:6s}: {score:5.1f}% {bar}")
+        if verbose:
+            print(f"\n✨ 주요 감정: {emotion_name} ({emotion_score:.1f}%)")
+            print("\n📊 감정 분포:")
+            sorted_emotions = sorted(emotions.items(), key=lambda x: x[1], reverse=True)
+            for emotion, score in sorted_emotions:
+                bar = "█" * int(score / 5)
+                print(f"  {emotion:6s}: {score:5.1f}% {bar}")
         
         result = {
             'text': text,
@@ -75,16 +105,17 @@ class EmotionCurator:
                 )
                 result['music'] = tracks
                 
-                if tracks:
+                if tracks and verbose:
                     print(f"\n🎵 추천 음악 TOP {len(tracks)}:")
                     for i, track in enumerate(tracks, 1):
                         print(f"{i}. {track['name']} - {track['artist']}")
             except Exception as e:
                 print(f"❌ 음악 추천 중 오류: {e}")
         
-        print("\n" + "=" * 60)
-        print("✅ 큐레이션 완료!")
-        print("=" * 60)
+        if verbose:
+            print("\n" + "=" * 60)
+            print("✅ 큐레이션 완료!")
+            print("=" * 60)
         
         return result
 
@@ -1,12 +1,241 @@
 import os
-from PIL import Image, ImageDraw, ImageFilter, ImageEnhance
+import io
+from collections import OrderedDict
+from PIL import Image, ImageDraw, ImageFilter, ImageStat
 from dotenv import load_dotenv
 import numpy as np
 import math
 import random
+import threading
+
+# Numba (선택) - 설치되어 있으면 픽셀 연산을 병렬 JIT 커널로 실행, 없으면 NumPy 사용
+try:
+    from numba import njit, prange
+except ImportError:
+    njit = None
 
 load_dotenv()
 
+# 밝기(L) 변환 가중치 (ITU-R 601, PIL 'L' 변환과 동일)
+LUMA_WEIGHTS = (0.299, 0.587, 0.114)
+
+# PNG zlib 압축 수준 (기본 6 대비 저장 시간 약 1/3, 파일은 약 1.4배)
+PNG_COMPRESS_LEVEL = 1
+
+# 그라데이션 색상표 크기 (위치 해상도 × 랜덤 블렌드 시작점 단계)
+GRADIENT_LUT_SIZE = 1024
+GRADIENT_LUT_LEVELS = 16
+
+# 사인 표 (marble 커널의 픽셀별 무늬 판정용, 한 칸 = 2π/4096)
+SIN_LUT_SIZE = 4096
+_SIN_LUT = np.sin(np.linspace(0, 2 * np.pi, SIN_LUT_SIZE, endpoint=False)).astype(np.float32)
+
+# 스타일별 내부 렌더링 배율 (블러로 세부가 사라지는 스타일은 낮은 해상도로 그린 후 확대)
+# dynamic은 픽셀 단위 노이즈 질감 유지, marble은 가는 무늬 유지를 위해 원본 해상도 (internal_scale로 낮출 수 있음)
+# aurora/abstract는 스타일 안에서 1/4로 그림
+STYLE_INTERNAL_SCALES = {
+    'waves': 2 / 3
+}
+
+# dynamic 스타일 방향 (Numba 커널에는 인덱스로 전달)
+DYNAMIC_DIRECTIONS = ['horizontal', 'vertical', 'diagonal', 'radial']
+
+
+if njit is not None:
+    @njit(fastmath=True, cache=True)
+    def _smooth_gradient_pixel(position, starts, ends, colors1, colors2, has_next, blend_starts, default_color):
+        """
+        픽셀 하나의 부드러운 그라데이션 색상 (_get_smooth_gradient_color_vec 와 동일)
+        """
+        for k in range(starts.shape[0]):
+            if starts[k] <= position <= ends[k]:
+                local_ratio = (position - starts[k]) / (ends[k] - starts[k])
+                blend_start = blend_starts[k]
+                
+                if has_next[k] and local_ratio > blend_start:
+                    blend_ratio = (local_ratio - blend_start) / (1 - blend_start)
+                    return (
+                        float(int(colors1[k, 0] * (1 - blend_ratio) + colors2[k, 0] * blend_ratio)),
+                        float(int(colors1[k, 1] * (1 - blend_ratio) + colors2[k, 1] * blend_ratio)),
+                        float(int(colors1[k, 2] * (1 - blend_ratio) + colors2[k, 2] * blend_ratio))
+                    )
+                return float(colors1[k, 0]), float(colors1[k, 1]), float(colors1[k, 2])
+        
+        return float(default_color[0]), float(default_color[1]), float(default_color[2])
+    
+    @njit(parallel=True, fastmath=True, cache=True)
+    def _dynamic_kernel(out, direction, wave_speeds, wave_amplitudes, phase_shifts,
+                        zone_mids, zone_range_widths, zone_strengths, zone_colors):
+        """
+        dynamic 스타일 픽셀 계산 (위치 → 블렌딩 → 밝기)을 행 단위 병렬 루프 하나로 처리
+        """
+        height, width = out.shape[0], out.shape[1]
+        num_waves = wave_speeds.shape[0]
+        
+        # sin(a + b) = sin a·cos b + cos a·sin b → 열(a)/행(b) 삼각함수만 미리 계산
+        col_sin = np.empty((num_waves, width))
+        col_cos = np.empty((num_waves, width))
+        row_sin = np.empty((num_waves, height))
+        row_cos = np.empty((num_waves, height))
+        for i in range(num_waves):
+            for x in range(width):
+                a = x / width * math.pi * wave_speeds[i] + phase_shifts[i]
+                col_sin[i, x] = math.sin(a)
+                col_cos[i, x] = math.cos(a)
+            for y in range(height):
+                b = y / height * math.pi * wave_speeds[i] * 0.7
+                row_sin[i, y] = math.sin(b)
+                row_cos[i, y] = math.cos(b)
+        
+        for y in prange(height):
+            norm_y = y / height
+            
+            for x in range(width):
+                norm_x = x / width
+                
+                # 방향에 따른 기본 위치
+                if direction == 0:
+                    base_position = norm_x
+                elif direction == 1:
+                    base_position = norm_y
+                elif direction == 2:
+                    base_position = (norm_x + norm_y) / 2
+                else:
+                    base_position = math.sqrt((norm_x - 0.5)**2 + (norm_y - 0.5)**2)
+                
+                # 다중 랜덤 사인파
+                wave_offset = 0.0
+                for i in range(num_waves):
+                    wave_offset += (
+                        col_sin[i, x] * row_cos[i, y] + col_cos[i, x] * row_sin[i, y]
+                    ) * wave_amplitudes[i]
+                
+                noise = np.random.uniform(-0.05, 0.05)
+                position = ((base_position + wave_offset + noise) % 1.0) * 100
+                
+                # 감정 색상 블렌딩 (_get_blended_color_vec 와 동일, 구역 배열 사용)
+                total_weight = 0.0
+                r, g, b = 0.0, 0.0, 0.0
+                
+                for z in range(zone_mids.shape[0]):
+                    distance = abs(position - zone_mids[z])
+                    range_width = zone_range_widths[z]
+                    
+                    # 범위 밖이면 가중치 0 (분기 없이)
+                    weight = max(0.0, 1 - distance / range_width) * zone_strengths[z]
+                    total_weight += weight
+                    r += zone_colors[z, 0] * weight
+                    g += zone_colors[z, 1] * weight
+                    b += zone_colors[z, 2] * weight
+                
+                if total_weight > 0:
+                    r /= total_weight
+                    g /= total_weight
+                    b /= total_weight
+                
+                # 랜덤 밝기 변화
+                brightness = 1.0 + np.random.uniform(-0.1, 0.1)
+                out[y, x, 0] = max(0, min(255, int(int(r) * brightness)))
+                out[y, x, 1] = max(0, min(255, int(int(g) * brightness)))
+                out[y, x, 2] = max(0, min(255, int(int(b) * brightness)))
+    
+    @njit(parallel=True, fastmath=True, cache=True)
+    def _wave_kernel(out, frequencies, amplitudes, starts, ends, colors1, colors2, has_next, blend_starts,
+                     default_color):
+        """
+        waves 스타일 픽셀 계산 (다중 물결 → 그라데이션 색상)을 행 단위 병렬 루프 하나로 처리
+        """
+        height, width = out.shape[0], out.shape[1]
+        
+        for y in prange(height):
+            norm_y = y / height
+            
+            for x in range(width):
+                norm_x = x / width
+                
+                # 다중 물결 (레이어마다 픽셀별 랜덤 위상)
+                wave_offset = 0.0
+                for i in range(frequencies.shape[0]):
+                    phase = np.random.uniform(0, math.pi)
+                    wave_offset += math.sin(
+                        norm_x * math.pi * frequencies[i] + 
+                        norm_y * math.pi + phase
+                    ) * amplitudes[i] / (i + 1)
+                
+                position = ((norm_x + wave_offset) % 1.0) * 100
+                r, g, b = _smooth_gradient_pixel(position, starts, ends, colors1, colors2, has_next, blend_starts, default_color)
+                
+                out[y, x, 0] = int(r)
+                out[y, x, 1] = int(g)
+                out[y, x, 2] = int(b)
+    
+    @njit(parallel=True, fastmath=True, cache=True)
+    def _marble_kernel(out, num_octaves, vein_frequency, vein_threshold, seed_offset_x, seed_offset_y,
+                       starts, ends, colors1, colors2, has_next, blend_starts, default_color):
+        """
+        marble 스타일 픽셀 계산 (옥타브 노이즈 → 그라데이션 색상 → 무늬)을 행 단위 병렬 루프 하나로 처리
+        """
+        height, width = out.shape[0], out.shape[1]
+        
+        # 옥타브별 열/행 삼각함수 미리 계산 (대각선 항은 sin(a + b) 전개)
+        col_sin5 = np.empty((num_octaves, width))
+        col_sin4 = np.empty((num_octaves, width))
+        col_cos4 = np.empty((num_octaves, width))
+        row_cos3 = np.empty((num_octaves, height))
+        row_sin4 = np.empty((num_octaves, height))
+        row_cos4 = np.empty((num_octaves, height))
+        frequency = 1.0
+        for octave in range(num_octaves):
+            for x in range(width):
+                a = (x / width + seed_offset_x) * math.pi * frequency
+                col_sin5[octave, x] = math.sin(a * 5)
+                col_sin4[octave, x] = math.sin(a * 4)
+                col_cos4[octave, x] = math.cos(a * 4)
+            for y in range(height):
+                norm_y = y / height
+                row_cos3[octave, y] = math.cos((norm_y + seed_offset_y) * math.pi * frequency * 3)
+                row_sin4[octave, y] = math.sin(norm_y * math.pi * frequency * 4)
+                row_cos4[octave, y] = math.cos(norm_y * math.pi * frequency * 4)
+            frequency *= 2
+        
+        for y in prange(height):
+            for x in range(width):
+                norm_x = x / width
+                
+                # 펄린 노이즈 느낌
+                noise = 0.0
+                amplitude = 1.0
+                
+                for octave in range(num_octaves):
+                    noise += amplitude * (
+                        col_sin5[octave, x] * row_cos3[octave, y] +
+                        col_sin4[octave, x] * row_cos4[octave, y] +
+                        col_cos4[octave, x] * row_sin4[octave, y]
+                    )
+                    amplitude *= 0.5
+                
+                position = max(0.0, min(100.0, ((noise + 2) / 4) * 100))
+                
+                # 그라데이션 색상
+                r, g, b = _smooth_gradient_pixel(position, starts, ends, colors1, colors2, has_next, blend_starts, default_color)
+                
+                # 대리석 무늬 (랜덤) - 임계값 비교만 하므로 sin은 표 조회로 충분
+                vein_angle = norm_x * vein_frequency + noise * 5
+                vein_sin = _SIN_LUT[int(vein_angle * (SIN_LUT_SIZE / (2 * math.pi))) & (SIN_LUT_SIZE - 1)]
+                if abs(vein_sin) < vein_threshold:
+                    darken = np.random.uniform(0.6, 0.8)
+                    r = float(int(r * darken))
+                    g = float(int(g * darken))
+                    b = float(int(b * darken))
+                
+                out[y, x, 0] = int(r)
+                out[y, x, 1] = int(g)
+                out[y, x, 2] = int(b)
+else:
+    _dynamic_kernel = None
+    _wave_kernel = None
+    _marble_kernel = None
+
 class ImageGenerator:
     """
     감정 비율 기반 예술적 그라데이션 아트 생성 (랜덤 변형)
@@ -21,31 +250,50 @@ class ImageGenerator:
             '당황': (255, 165, 0),      # Orange
             '기쁨': (255, 215, 0)       # Gold
         }
+        
+        # 색상 팔레트 배열 (감정 이름 → 행 인덱스, 벡터 연산/Numba 커널용)
+        self._emotion_names = list(self.emotion_colors)
+        self._emotion_idx = {emotion: i for i, emotion in enumerate(self._emotion_names)}
+        self._palette = np.array(
+            [self.emotion_colors[emotion] for emotion in self._emotion_names],
+            dtype=np.float32
+        )
+        
+        # 그라데이션 색상표 LRU 캐시 (같은 감정 비율이면 스타일/호출 간 재사용)
+        self.gradient_lut_cache = OrderedDict()
+        self.gradient_lut_cache_size = 16
+        self._gradient_lut_cache_lock = threading.Lock()
     
-    def generate_image(self, emotion_percentages, save_path=None, style='dynamic'):
+    def generate_image(self, emotion_percentages, save_path=None, style='dynamic', seed=None, internal_scale=None):
         """
         감정 비율에 따른 예술적 그라데이션 이미지 생성
         
         Parameters:
         - emotion_percentages: dict {'분노': 10.5, '슬픔': 20.3, ...}
-        - save_path: 저장 경로
+        - save_path: 저장 경로 (None이면 파일로 저장하지 않음)
         - style: 'dynamic', 'waves', 'aurora', 'abstract', 'marble'
+        - seed: 랜덤 시드 (None이면 매번 다른 결과, 정수면 같은 결과 재현.
+          단 Numba 커널의 픽셀별 노이즈는 스레드별 난수라 제외)
+        - internal_scale: 내부 렌더링 배율 (None이면 STYLE_INTERNAL_SCALES 기본값, 1.0이면 원본 해상도)
         
         Returns:
         - PIL Image
         """
-        if save_path is None:
-            main_emotion = max(emotion_percentages.items(), key=lambda x: x[1])[0]
-            save_path = f'emotion_art_{main_emotion}.png'
-        
-        # 랜덤 시드 (매번 다른 결과)
-        random.seed()
+        # 랜덤 시드 (파라미터는 random.Random, 픽셀 배열은 NumPy 난수 생성기)
+        # 인스턴스가 세션/스레드 간 공유되므로 호출마다 로컬 생성기를 만들어 전달
+        rnd = random.Random(seed)
+        rng = np.random.default_rng(seed)
         
         print(f"\n🎨 예술적 그라데이션 생성 중... (스타일: {style})")
         
         # 이미지 크기
         width, height = 1920, 1080
         
+        # 내부 렌더링 크기
+        if internal_scale is None:
+            internal_scale = STYLE_INTERNAL_SCALES.get(style, 1.0)
+        render_width, render_height = round(width * internal_scale), round(height * internal_scale)
+        
         # 감정별 색상과 비율 준비
         emotions_sorted = sorted(emotion_percentages.items(), 
                                 key=lambda x: x[1], 
@@ -57,149 +305,198 @@ class ImageGenerator:
         
         # 스타일별 이미지 생성 (랜덤 파라미터 포함)
         if style == 'waves':
-            image = self._create_wave_style(width, height, emotions_sorted)
+            image = self._create_wave_style(render_width, render_height, emotions_sorted, rnd, rng, scale=internal_scale)
         elif style == 'aurora':
-            image = self._create_aurora_style(width, height, emotions_sorted)
+            image = self._create_aurora_style(render_width, render_height, emotions_sorted, rnd, rng)
         elif style == 'abstract':
-            image = self._create_abstract_style(width, height, emotions_sorted)
+            image = self._create_abstract_style(render_width, render_height, emotions_sorted, rnd, rng)
         elif style == 'marble':
-            image = self._create_marble_style(width, height, emotions_sorted)
+            image = self._create_marble_style(render_width, render_height, emotions_sorted, rnd, rng, scale=internal_scale)
         else:  # dynamic
-            image = self._create_dynamic_style(width, height, emotions_sorted)
+            image = self._create_dynamic_style(render_width, render_height, emotions_sorted, rnd, rng)
+        
+        # 낮은 해상도로 그렸으면 원본 크기로 확대
+        if image.size != (width, height):
+            image = image.resize((width, height), Image.LANCZOS)
         
         # 후처리: 색상 강화 (랜덤 강도)
-        image = self._enhance_colors(image)
+        image = self._enhance_colors(image, rnd)
         
         # 저장
-        image.save(save_path, quality=95)
-        print(f"✓ 이미지 저장: {save_path}")
+        if save_path is not None:
+            # quality는 JPEG 전용 (PNG는 무시하고 기본 압축 수준 사용)
+            if os.path.splitext(save_path)[1].lower() in ('.jpg', '.jpeg'):
+                image.save(save_path, quality=95)
+            else:
+                image.save(save_path, compress_level=PNG_COMPRESS_LEVEL)
+            print(f"✓ 이미지 저장: {save_path}")
         
         return image
     
-    def _create_dynamic_style(self, width, height, emotions_sorted):
+    def generate_image_bytes(self, emotion_percentages, style='dynamic', seed=None, internal_scale=None):
         """
-        역동적인 곡선 스타일 (랜덤 변형)
+        감정 아트를 파일 없이 메모리에서 PNG 바이트로 생성
+        (동시 사용자 간 파일 충돌 / 디스크 재읽기 방지)
+        
+        Returns:
+        - bytes: PNG 이미지 데이터
         """
-        image = Image.new('RGB', (width, height))
-        pixels = image.load()
+        image = self.generate_image(emotion_percentages, style=style, seed=seed, internal_scale=internal_scale)
         
+        buffer = io.BytesIO()
+        image.save(buffer, format='PNG', compress_level=PNG_COMPRESS_LEVEL)
+        return buffer.getvalue()
+    
+    def _uniform(self, rng, low, high, size):
+        """
+        [low, high) 균등 분포 float32 난수 배열 (픽셀별 랜덤 값)
+        
+        Parameters:
+        - rng: NumPy 난수 생성기 (generate_image 호출별)
+        """
+        return low + (high - low) * rng.random(size, dtype=np.float32)
+    
+    def _create_dynamic_style(self, width, height, emotions_sorted, rnd, rng):
+        """
+        역동적인 곡선 스타일 (랜덤 변형)
+        """
         # 랜덤 파라미터
-        num_waves = random.randint(3, 6)  # 물결 개수
-        wave_speeds = [random.uniform(1.5, 4.0) for _ in range(num_waves)]
-        wave_amplitudes = [random.uniform(0.1, 0.4) for _ in range(num_waves)]
-        phase_shifts = [random.uniform(0, math.pi * 2) for _ in range(num_waves)]
+        num_waves = rnd.randint(3, 6)  # 물결 개수
+        wave_speeds = [rnd.uniform(1.5, 4.0) for _ in range(num_waves)]
+        wave_amplitudes = [rnd.uniform(0.1, 0.4) for _ in range(num_waves)]
+        phase_shifts = [rnd.uniform(0, math.pi * 2) for _ in range(num_waves)]
         
         # 랜덤 방향 (수평/수직/대각선)
-        direction = random.choice(['horizontal', 'vertical', 'diagonal', 'radial'])
+        direction = rnd.choice(DYNAMIC_DIRECTIONS)
         
         print(f"   🎲 랜덤 설정: {num_waves}개 물결, {direction} 방향")
         
-        # 감정별 위치 및 영향력
-        emotion_zones = []
-        cumulative = 0
-        
-        for emotion, percent in emotions_sorted:
-            if percent > 0:
-                start = cumulative
-                end = cumulative + percent
-                emotion_zones.append({
-                    'emotion': emotion,
-                    'color': self.emotion_colors[emotion],
-                    'start': start,
-                    'end': end,
-                    'strength': percent / 100
-                })
-                cumulative = end
-        
-        # 픽셀별 색상 계산
-        for y in range(height):
-            for x in range(width):
-                norm_x = x / width
-                norm_y = y / height
-                
-                # 방향에 따른 기본 위치
-                if direction == 'horizontal':
-                    base_position = norm_x
-                elif direction == 'vertical':
-                    base_position = norm_y
-                elif direction == 'diagonal':
-                    base_position = (norm_x + norm_y) / 2
-                else:  # radial
-                    cx, cy = 0.5, 0.5
-                    distance = math.sqrt((norm_x - cx)**2 + (norm_y - cy)**2)
-                    base_position = distance
-                
-                # 다중 랜덤 사인파
-                wave_offset = 0
-                for i in range(num_waves):
-                    wave_offset += math.sin(
-                        norm_x * math.pi * wave_speeds[i] + 
-                        norm_y * math.pi * wave_speeds[i] * 0.7 +
-                        phase_shifts[i]
-                    ) * wave_amplitudes[i]
-                
-                # 추가 노이즈
-                noise = random.uniform(-0.05, 0.05)
-                position = (base_position + wave_offset + noise) % 1.0
-                
-                # 색상 계산
-                color = self._get_blended_color(position * 100, emotion_zones)
-                
-                # 랜덤 밝기 변화 (미묘하게)
-                brightness = 1.0 + random.uniform(-0.1, 0.1)
-                color = tuple(int(c * brightness) for c in color)
-                color = tuple(max(0, min(255, c)) for c in color)
-                
-                pixels[x, y] = color
-        
-        return image
+        # 감정별 위치 및 영향력 (구역별 병렬 배열: 픽셀 루프에서 dict 조회 없이 연속 메모리 접근)
+        zone_emotions = [(emotion, percent) for emotion, percent in emotions_sorted if percent > 0]
+        percents = np.array([percent for _, percent in zone_emotions], dtype=np.float32)
+        ends = np.cumsum(percents)
+        zone_mids = ends - percents / 2
+        zone_strengths = percents / 100
+        # 랜덤 범위 폭 (이미지마다 감정별로 한 번)
+        zone_range_widths = percents / 2 + np.array(
+            [rnd.uniform(15, 25) for _ in zone_emotions], dtype=np.float32
+        )
+        zone_colors = self._palette[[self._emotion_idx[emotion] for emotion, _ in zone_emotions]]
+        
+        if _dynamic_kernel is not None:
+            # Numba: 픽셀별 계산을 중간 배열 없이 한 번에 (행 단위 멀티코어)
+            colors = np.empty((height, width, 3), dtype=np.uint8)
+            _dynamic_kernel(
+                colors,
+                DYNAMIC_DIRECTIONS.index(direction),
+                np.array(wave_speeds, dtype=np.float32),
+                np.array(wave_amplitudes, dtype=np.float32),
+                np.array(phase_shifts, dtype=np.float32),
+                zone_mids, zone_range_widths, zone_strengths, zone_colors
+            )
+            return Image.fromarray(colors, 'RGB')
+        
+        # 픽셀 좌표 (가로 1행 / 세로 1열 → 브로드캐스트)
+        norm_x = np.arange(width, dtype=np.float32) / width
+        norm_y = (np.arange(height, dtype=np.float32) / height)[:, None]
+        
+        # 방향에 따른 기본 위치
+        if direction == 'horizontal':
+            base_position = norm_x
+        elif direction == 'vertical':
+            base_position = norm_y
+        elif direction == 'diagonal':
+            base_position = (norm_x + norm_y) / 2
+        else:  # radial
+            cx, cy = 0.5, 0.5
+            base_position = np.sqrt((norm_x - cx)**2 + (norm_y - cy)**2)
+        
+        # 다중 랜덤 사인파
+        wave_offset = np.zeros((height, width), dtype=np.float32)
+        for i in range(num_waves):
+            wave_offset += np.sin(
+                norm_x * math.pi * wave_speeds[i] + 
+                norm_y * math.pi * wave_speeds[i] * 0.7 +
+                phase_shifts[i]
+            ) * wave_amplitudes[i]
+        
+        # 추가 노이즈 (픽셀별)
+        noise = self._uniform(rng, -0.05, 0.05, size=(height, width))
+        position = (base_position + wave_offset + noise) % 1.0
+        
+        # 색상 계산
+        colors = np.floor(self._get_blended_color_vec(
+            position * 100, zone_mids, zone_range_widths, zone_strengths, zone_colors
+        ))
+        
+        # 랜덤 밝기 변화 (미묘하게, 픽셀별)
+        brightness = 1.0 + self._uniform(rng, -0.1, 0.1, size=(height, width, 1))
+        colors = np.clip(np.floor(colors * brightness), 0, 255)
+        
+        return Image.fromarray(colors.astype(np.uint8), 'RGB')
     
-    def _create_wave_style(self, width, height, emotions_sorted):
+    def _create_wave_style(self, width, height, emotions_sorted, rnd, rng, scale=1.0):
         """
         물결 스타일 (랜덤 변형)
+        scale: 원본 대비 내부 렌더링 배율 (블러 반경도 같은 비율로 줄임)
         """
-        image = Image.new('RGB', (width, height))
-        pixels = image.load()
-        
         # 랜덤 물결 파라미터
-        num_layers = random.randint(3, 6)
-        frequencies = [random.uniform(1.5, 4.5) for _ in range(num_layers)]
-        amplitudes = [random.uniform(0.05, 0.2) for _ in range(num_layers)]
+        num_layers = rnd.randint(3, 6)
+        frequencies = [rnd.uniform(1.5, 4.5) for _ in range(num_layers)]
+        amplitudes = [rnd.uniform(0.05, 0.2) for _ in range(num_layers)]
         
         print(f"   🎲 랜덤 설정: {num_layers}개 레이어")
         
-        for y in range(height):
-            for x in range(width):
-                norm_x = x / width
-                norm_y = y / height
-                
-                # 다중 물결
-                wave_offset = 0
-                for i in range(num_layers):
-                    phase = random.uniform(0, math.pi)
-                    wave_offset += math.sin(
-                        norm_x * math.pi * frequencies[i] + 
-                        norm_y * math.pi + phase
-                    ) * amplitudes[i] / (i + 1)
-                
-                position = (norm_x + wave_offset) % 1.0
-                color = self._get_smooth_gradient_color(position * 100, emotions_sorted)
-                
-                pixels[x, y] = color
+        blend_starts = self._random_blend_starts(emotions_sorted, rng)
+        
+        if _wave_kernel is not None:
+            # Numba: 물결/색상 계산을 중간 배열 없이 한 번에 (행 단위 멀티코어)
+            colors = np.empty((height, width, 3), dtype=np.uint8)
+            _wave_kernel(
+                colors,
+                np.array(frequencies, dtype=np.float32),
+                np.array(amplitudes, dtype=np.float32),
+                *self._gradient_segments(emotions_sorted),
+                blend_starts,
+                self._palette[self._emotion_idx[emotions_sorted[0][0]]]
+            )
+        else:
+            # 픽셀 좌표 (가로 1행 / 세로 1열 → 브로드캐스트)
+            norm_x = np.arange(width, dtype=np.float32) / width
+            norm_y = (np.arange(height, dtype=np.float32) / height)[:, None]
+            
+            # 다중 물결 (레이어마다 픽셀별 랜덤 위상)
+            wave_offset = np.zeros((height, width), dtype=np.float32)
+            for i in range(num_layers):
+                phase = self._uniform(rng, 0, math.pi, size=(height, width))
+                wave_offset += np.sin(
+                    norm_x * math.pi * frequencies[i] + 
+                    norm_y * math.pi + phase
+                ) * amplitudes[i] / (i + 1)
+            
+            position = (norm_x + wave_offset) % 1.0
+            lut = self._build_gradient_lut(emotions_sorted, blend_starts)
+            colors = self._sample_gradient_lut(lut, position * 100)
+        
+        image = Image.fromarray(colors, 'RGB')
         
         # 랜덤 블러 강도
-        blur_radius = random.randint(10, 25)
-        image = image.filter(ImageFilter.GaussianBlur(radius=blur_radius))
+        blur_radius = rnd.randint(10, 25)
+        image = image.filter(ImageFilter.GaussianBlur(radius=blur_radius * scale))
         
         return image
     
-    def _create_aurora_style(self, width, height, emotions_sorted):
+    def _create_aurora_style(self, width, height, emotions_sorted, rnd, rng):
         """
         오로라 스타일 (랜덤 변형)
         """
+        # 강한 블러(30~50px)로 세부 형태가 사라지므로 1/4 해상도에서 그린 후 확대
+        scale = 4
+        output_size = (width, height)
+        
         # 랜덤 배경색
-        bg_darkness = random.randint(5, 25)
-        image = Image.new('RGB', (width, height), (bg_darkness, bg_darkness, bg_darkness + 20))
+        bg_darkness = rnd.randint(5, 25)
+        image = Image.new('RGB', (width // scale, height // scale), (bg_darkness, bg_darkness, bg_darkness + 20))
         draw = ImageDraw.Draw(image, 'RGBA')
         
         print(f"   🎲 랜덤 설정: 배경 어두움 {bg_darkness}")
@@ -210,71 +507,77 @@ class ImageGenerator:
                 continue
             
             color = self.emotion_colors[emotion]
-            alpha = int(percent * random.uniform(1.8, 2.8))
+            alpha = int(percent * rnd.uniform(1.8, 2.8))
             color_with_alpha = color + (min(255, alpha),)
             
             # 랜덤 곡선 개수
-            num_curves = random.randint(2, 5)
+            num_curves = rnd.randint(2, 5)
             
             for i in range(num_curves):
-                points = []
-                
                 # 랜덤 시작 위치
-                y_base = random.uniform(0.2, 0.8) * height
-                frequency = random.uniform(2, 5)
-                amplitude = random.uniform(0.1, 0.2) * height
+                y_base = rnd.uniform(0.2, 0.8) * height
+                frequency = rnd.uniform(2, 5)
+                amplitude = rnd.uniform(0.1, 0.2) * height
+                phase = rnd.uniform(0, math.pi * 2)
                 
-                for x in range(0, width + 10, 10):
-                    phase = random.uniform(0, math.pi * 2)
-                    y = y_base + math.sin(x / width * math.pi * frequency + phase) * amplitude
-                    y += math.cos(x / width * math.pi * (frequency * 1.3)) * amplitude * 0.5
-                    points.append((x, int(y)))
+                # 곡선 좌표 (원본 해상도 기준으로 점 전체를 한 번에 계산 후 축소)
+                xs = np.arange(0, width + 10, 10)
+                ys = y_base + np.sin(xs / width * math.pi * frequency + phase) * amplitude
+                ys += np.cos(xs / width * math.pi * (frequency * 1.3)) * amplitude * 0.5
+                points = np.column_stack((xs, ys.astype(int))) / scale
                 
                 # 랜덤 선 두께
-                line_width = random.randint(60, 120)
+                line_width = rnd.randint(60, 120)
                 
                 if len(points) > 1:
-                    draw.line(points, fill=color_with_alpha, width=line_width)
+                    draw.line(points.ravel().tolist(), fill=color_with_alpha, width=round(line_width / scale))
         
         # 랜덤 블러
-        blur_radius = random.randint(30, 50)
-        image = image.filter(ImageFilter.GaussianBlur(radius=blur_radius))
+        blur_radius = rnd.randint(30, 50)
+        image = image.filter(ImageFilter.GaussianBlur(radius=blur_radius / scale))
         
-        return image
+        return image.resize(output_size, Image.BILINEAR)
     
-    def _create_abstract_style(self, width, height, emotions_sorted):
+    def _create_abstract_style(self, width, height, emotions_sorted, rnd, rng):
         """
         추상화 스타일 (랜덤 변형)
         """
-        image = Image.new('RGB', (width, height))
+        # 강한 블러(40~70px)로 세부 형태가 사라지므로 1/4 해상도에서 그린 후 확대
+        scale = 4
+        output_size = (width, height)
+        width, height = width // scale, height // scale
+        
+        # 배경 그라데이션 (행별 색상을 한 번에 계산 후 가로로 복제)
+        positions = np.arange(height, dtype=np.float32) / height * 100
+        lut = self._build_gradient_lut(emotions_sorted, self._random_blend_starts(emotions_sorted, rng))
+        row_colors = self._sample_gradient_lut(lut, positions)
+        background = np.broadcast_to(
+            row_colors[:, None, :],
+            (height, width, 3)
+        )
+        image = Image.fromarray(np.ascontiguousarray(background), 'RGB')
         draw = ImageDraw.Draw(image, 'RGBA')
         
-        # 배경 그라데이션
-        for y in range(height):
-            ratio = y / height
-            base_color = self._get_smooth_gradient_color(ratio * 100, emotions_sorted)
-            draw.line([(0, y), (width, y)], fill=base_color)
-        
         # 감정별 추상 도형
         for idx, (emotion, percent) in enumerate(emotions_sorted):
             if percent < 5:
                 continue
             
             color = self.emotion_colors[emotion]
-            alpha = int(percent * random.uniform(1.2, 2.0))
+            alpha = int(percent * rnd.uniform(1.2, 2.0))
             color_with_alpha = color + (min(255, alpha),)
             
             # 랜덤 도형 개수
-            num_shapes = random.randint(2, 6)
+            num_shapes = rnd.randint(2, 6)
             
             print(f"   🎲 {emotion}: {num_shapes}개 도형")
             
             for i in range(num_shapes):
                 # 랜덤 위치와 크기
-                cx = random.randint(0, width)
-                cy = random.randint(0, height)
-                radius_x = random.randint(int(width * 0.05), int(width * 0.2))
-                radius_y = random.randint(int(height * 0.1), int(height * 0.25))
+                cx = rnd.randint(0, width)
+                cy = rnd.randint(0, height)
+                radius_x = rnd.randint(int(width * 0.05), int(width * 0.2))
+                radius_y = rnd.randint(int(height * 0.1), int(height * 0.25))
                 
                 bbox = [
                     cx - radius_x, cy - radius_y,
@@ -282,167 +585,320 @@ class ImageGenerator:
                 ]
                 
                 # 랜덤 도형 선택
-                shape_type = random.choice(['ellipse', 'ellipse', 'rectangle'])
+                shape_type = rnd.choice(['ellipse', 'ellipse', 'rectangle'])
                 
                 if shape_type == 'ellipse':
                     draw.ellipse(bbox, fill=color_with_alpha)
                 else:
                     draw.rectangle(bbox, fill=color_with_alpha)
         
-        # 랜덤 블러
-        blur_radius = random.randint(40, 70)
-        image = image.filter(ImageFilter.GaussianBlur(radius=blur_radius))
+        # 랜덤 블러 (렌더링 해상도에 맞게 축소)
+        blur_radius = rnd.randint(40, 70)
+        image = image.filter(ImageFilter.GaussianBlur(radius=blur_radius / scale))
         
-        return image
+        return image.resize(output_size, Image.BILINEAR)
     
-    def _create_marble_style(self, width, height, emotions_sorted):
+    def _create_marble_style(self, width, height, emotions_sorted, rnd, rng, scale=1.0):
         """
         대리석 스타일 (랜덤 변형)
+        scale: 원본 대비 내부 렌더링 배율 (블러 반경도 같은 비율로 줄임)
         """
-        image = Image.new('RGB', (width, height))
-        pixels = image.load()
-        
         # 랜덤 대리석 파라미터
-        num_octaves = random.randint(4, 7)
-        vein_frequency = random.uniform(15, 30)
-        vein_threshold = random.uniform(0.08, 0.15)
+        num_octaves = rnd.randint(4, 7)
+        vein_frequency = rnd.uniform(15, 30)
+        vein_threshold = rnd.uniform(0.08, 0.15)
         
         print(f"   🎲 랜덤 설정: {num_octaves}개 옥타브, 무늬 빈도 {vein_frequency:.1f}")
         
         # 랜덤 시드로 노이즈 변형
-        seed_offset_x = random.uniform(0, 100)
-        seed_offset_y = random.uniform(0, 100)
-        
-        for y in range(height):
-            for x in range(width):
-                norm_x = x / width
-                norm_y = y / height
-                
-                # 펄린 노이즈 느낌
-                noise = 0
-                frequency = 1
-                amplitude = 1
-                
-                for octave in range(num_octaves):
-                    noise += amplitude * (
-                        math.sin((norm_x + seed_offset_x) * math.pi * frequency * 5) * 
-                        math.cos((norm_y + seed_offset_y) * math.pi * frequency * 3) +
-                        math.sin(((norm_x + norm_y) + seed_offset_x) * math.pi * frequency * 4)
-                    )
-                    frequency *= 2
-                    amplitude *= 0.5
-                
-                # 노이즈 정규화
-                position = ((noise + 2) / 4) * 100
-                position = max(0, min(100, position))
-                
-                # 색상
-                color = self._get_smooth_gradient_color(position, emotions_sorted)
-                
-                # 대리석 무늬 (랜덤)
-                vein = abs(math.sin(norm_x * vein_frequency + noise * 5)) < vein_threshold
-                if vein:
-                    darken = random.uniform(0.6, 0.8)
-                    color = tuple(int(c * darken) for c in color)
-                
-                pixels[x, y] = color
+        seed_offset_x = rnd.uniform(0, 100)
+        seed_offset_y = rnd.uniform(0, 100)
+        
+        blend_starts = self._random_blend_starts(emotions_sorted, rng)
+        
+        if _marble_kernel is not None:
+            # Numba: 옥타브/색상/무늬 계산을 중간 배열 없이 한 번에 (행 단위 멀티코어)
+            colors = np.empty((height, width, 3), dtype=np.uint8)
+            _marble_kernel(
+                colors,
+                num_octaves,
+                vein_frequency,
+                vein_threshold,
+                seed_offset_x,
+                seed_offset_y,
+                *self._gradient_segments(emotions_sorted),
+                blend_starts,
+                self._palette[self._emotion_idx[emotions_sorted[0][0]]]
+            )
+            image = Image.fromarray(colors, 'RGB')
+        else:
+            # 픽셀 좌표 (가로 1행 / 세로 1열 → 브로드캐스트)
+            norm_x = np.arange(width, dtype=np.float32) / width
+            norm_y = (np.arange(height, dtype=np.float32) / height)[:, None]
+            
+            # 펄린 노이즈 느낌 (옥타브별로 전체 픽셀 한 번에 누적)
+            noise = np.zeros((height, width), dtype=np.float32)
+            frequency = 1
+            amplitude = 1
+            
+            for octave in range(num_octaves):
+                # 대각선 항 sin(a + b)는 열(a)/행(b) 삼각함수로 전개 → 모두 1차원 계산
+                a = (norm_x + seed_offset_x) * math.pi * frequency * 4
+                b = norm_y * math.pi * frequency * 4
+                noise += amplitude * (
+                    np.sin((norm_x + seed_offset_x) * math.pi * frequency * 5) * 
+                    np.cos((norm_y + seed_offset_y) * math.pi * frequency * 3) +
+                    np.sin(a) * np.cos(b) + np.cos(a) * np.sin(b)
+                )
+                frequency *= 2
+                amplitude *= 0.5
+            
+            # 노이즈 정규화
+            position = np.clip(((noise + 2) / 4) * 100, 0, 100)
+            
+            # 색상
+            lut = self._build_gradient_lut(emotions_sorted, blend_starts)
+            colors = self._sample_gradient_lut(lut, position)
+            
+            # 대리석 무늬 (랜덤 어둡게)
+            vein = np.abs(np.sin(norm_x * vein_frequency + noise * 5)) < vein_threshold
+            darken = self._uniform(rng, 0.6, 0.8, size=(int(vein.sum()), 1))
+            colors[vein] = colors[vein] * darken
+            
+            image = Image.fromarray(colors, 'RGB')
         
         # 랜덤 블러
-        blur_radius = random.randint(1, 4)
-        image = image.filter(ImageFilter.GaussianBlur(radius=blur_radius))
+        blur_radius = rnd.randint(1, 4)
+        image = image.filter(ImageFilter.GaussianBlur(radius=blur_radius * scale))
         
         return image
     
-    def _get_blended_color(self, position, emotion_zones):
+    def _get_blended_color_vec(self, positions, zone_mids, zone_range_widths, zone_strengths, zone_colors):
         """
-        여러 감정 색상을 블렌딩 (랜덤 변형)
+        여러 감정 색상을 블렌딩 (위치 배열 전체를 한 번에 계산)
+        
+        Parameters:
+        - positions: 0~100 위치 배열 (임의 shape)
+        - zone_mids: 구역별 중심 위치 (K,)
+        - zone_range_widths: 구역별 범위 폭 (K,)
+        - zone_strengths: 구역별 영향력 (K,)
+        - zone_colors: 구역별 RGB (K, 3)
+        
+        Returns:
+        - np.ndarray: positions.shape + (3,) RGB (float32, 블렌딩 결과 없으면 검정)
         """
-        total_weight = 0
-        blended_r, blended_g, blended_b = 0, 0, 0
+        positions = np.asarray(positions, dtype=np.float32)
         
-        for zone in emotion_zones:
-            mid_point = (zone['start'] + zone['end']) / 2
-            distance = abs(position - mid_point)
-            
-            # 랜덤 범위 폭
-            range_width = (zone['end'] - zone['start']) / 2 + random.uniform(15, 25)
+        total_weight = np.zeros(positions.shape, dtype=np.float32)
+        blended = np.zeros(positions.shape + (3,), dtype=np.float32)
+        
+        for z in range(len(zone_mids)):
+            distance = np.abs(positions - zone_mids[z])
             
-            if distance < range_width:
-                weight = (1 - distance / range_width) * zone['strength']
-                total_weight += weight
-                
-                color = zone['color']
-                blended_r += color[0] * weight
-                blended_g += color[1] * weight
-                blended_b += color[2] * weight
+            # 범위 밖이면 가중치 0 (분기 없이)
+            weight = np.maximum(1 - distance / zone_range_widths[z], 0) * zone_strengths[z]
+            total_weight += weight
+            blended += weight[..., None] * zone_colors[z]
         
-        if total_weight > 0:
-            blended_r /= total_weight
-            blended_g /= total_weight
-            blended_b /= total_weight
+        # 가중치 합이 0인 픽셀은 0 / tiny = 0 (검정)
+        blended /= np.maximum(total_weight, np.finfo(np.float32).tiny)[..., None]
         
-        return (int(blended_r), int(blended_g), int(blended_b))
+        return blended
     
-    def _get_smooth_gradient_color(self, position, emotions_sorted):
+    def _random_blend_starts(self, emotions_sorted, rng):
         """
-        부드러운 그라데이션 색상
+        감정 구간별 랜덤 블렌드 시작점 (이미지마다 한 번, 구간 전체에 같은 값)
+        
+        Parameters:
+        - rng: NumPy 난수 생성기 (generate_image 호출별)
+        
+        Returns:
+        - np.ndarray: (비율이 0이 아닌 감정 수,) 0.5~0.7 (float32)
         """
-        cumulative = 0
+        num_segments = sum(1 for _, percent in emotions_sorted if percent != 0)
+        return self._uniform(rng, 0.5, 0.7, size=num_segments)
+    
+    def _build_gradient_lut(self, emotions_sorted, blend_starts, size=GRADIENT_LUT_SIZE, levels=GRADIENT_LUT_LEVELS):
+        """
+        부드러운 그라데이션 색상표 (위치 → RGB를 미리 계산해 픽셀마다 다시 계산하지 않음)
+        블렌드 시작점 levels 단계별 색상표는 캐시하고, 구간마다 가장 가까운 단계를 골라 조합
         
-        for i, (emotion, percent) in enumerate(emotions_sorted):
-            if percent == 0:
-                continue
+        Parameters:
+        - emotions_sorted: [(감정, 비율), ...] (비율 내림차순)
+        - blend_starts: 감정 구간별 블렌드 시작점 (_random_blend_starts 결과)
+        - size: 0~100 위치를 나눌 단계 수
+        - levels: 블렌드 시작점(0.5~0.7)을 나눌 단계 수
+        
+        Returns:
+        - np.ndarray: (size, 3) RGB (uint8)
+        """
+        # 키는 비율을 소수 첫째 자리로 반올림 (색상 차이가 보이지 않는 근접 비율끼리 재사용)
+        key = (tuple((emotion, round(percent, 1)) for emotion, percent in emotions_sorted), size, levels)
+        
+        with self._gradient_lut_cache_lock:
+            cached = self.gradient_lut_cache.get(key)
+            if cached is not None:
+                self.gradient_lut_cache.move_to_end(key)
+        
+        if cached is not None:
+            table, segment = cached
+        else:
+            positions = np.linspace(0, 100, size, dtype=np.float32)
+            blend_start = np.linspace(0.5, 0.7, levels, dtype=np.float32)[:, None]
             
-            start = cumulative
-            end = cumulative + percent
+            table = self._get_smooth_gradient_color_vec(
+                np.broadcast_to(positions, (levels, size)), emotions_sorted, blend_start
+            ).astype(np.uint8)
             
-            if start <= position <= end:
-                local_ratio = (position - start) / (end - start) if end > start else 0
-                
-                color1 = self.emotion_colors[emotion]
-                
-                # 다음 감정과 블렌딩 (랜덤 블렌드 시작점)
-                blend_start = random.uniform(0.5, 0.7)
-                
-                if i < len(emotions_sorted) - 1 and local_ratio > blend_start:
-                    next_emotion = emotions_sorted[i + 1][0]
-                    color2 = self.emotion_colors[next_emotion]
-                    blend_ratio = (local_ratio - blend_start) / (1 - blend_start)
-                    return self._blend_colors(color1, color2, blend_ratio)
-                
-                return color1
+            # 위치별 구간 번호 (경계값은 앞 구간, 구간 밖은 구간 수)
+            segment = np.searchsorted(self._gradient_segments(emotions_sorted)[1], positions, side='left')
+            table.flags.writeable = False
+            segment.flags.writeable = False
             
-            cumulative = end
+            with self._gradient_lut_cache_lock:
+                self.gradient_lut_cache[key] = (table, segment)
+                self.gradient_lut_cache.move_to_end(key)
+                if len(self.gradient_lut_cache) > self.gradient_lut_cache_size:
+                    self.gradient_lut_cache.popitem(last=False)
+        
+        # 구간별 블렌드 시작점 → 가장 가까운 단계 (구간 밖은 블렌딩 없음 → 아무 단계)
+        level = np.rint((np.asarray(blend_starts, dtype=np.float32) - 0.5) / 0.2 * (levels - 1)).astype(np.intp)
+        np.clip(level, 0, levels - 1, out=level)
+        level = np.append(level, 0)
+        
+        return table[level[segment], np.arange(size)]
+    
+    def _sample_gradient_lut(self, lut, positions):
+        """
+        색상표에서 위치 배열의 색상 조회
+        인접한 두 항목 사이는 uint16 고정소수점(1/256)으로 선형 보간
+        
+        Parameters:
+        - lut: _build_gradient_lut 결과
+        - positions: 0~100 위치 배열 (임의 shape)
+        
+        Returns:
+        - np.ndarray: positions.shape + (3,) RGB (uint8)
+        """
+        size = lut.shape[0]
+        
+        scaled = np.asarray(positions, dtype=np.float32) * ((size - 1) / 100)
+        np.clip(scaled, 0, size - 1, out=scaled)
+        idx = scaled.astype(np.int32)
+        frac = ((scaled - idx) * 256).astype(np.uint16)[..., None]
+        
+        # (c1·(256 - f) + c2·f + 128) >> 8  (최대 255·256 + 128 → uint16 범위 안)
+        lut = lut.astype(np.uint16)
+        colors = lut[idx]
+        colors *= 256 - frac
+        next_colors = lut[np.minimum(idx + 1, size - 1)]
+        next_colors *= frac
+        colors += next_colors
+        colors += 128
+        colors >>= 8
+        
+        return colors.astype(np.uint8)
+    
+    def _gradient_segments(self, emotions_sorted):
+        """
+        부드러운 그라데이션의 감정 구간 배열 (비율이 0이 아닌 감정만)
         
-        return self.emotion_colors[emotions_sorted[0][0]]
+        Returns:
+        - (starts, ends, colors1, colors2, has_next)
+          colors2: 블렌딩할 다음 감정 색상, has_next: 다음 감정 존재 여부
+        """
+        idx = np.array([self._emotion_idx[emotion] for emotion, _ in emotions_sorted], dtype=np.intp)
+        percents = np.array([percent for _, percent in emotions_sorted], dtype=np.float64)
+        
+        # 다음 감정 (마지막이면 블렌딩 없음 → 자기 색상)
+        next_idx = np.append(idx[1:], idx[-1:])
+        has_next = np.arange(len(idx)) < len(idx) - 1
+        
+        ends = np.cumsum(percents)
+        keep = percents != 0
+        
+        return (
+            (ends - percents)[keep].astype(np.float32),
+            ends[keep].astype(np.float32),
+            self._palette[idx[keep]],
+            self._palette[next_idx[keep]],
+            has_next[keep]
+        )
     
-    def _blend_colors(self, color1, color2, ratio):
+    def _get_smooth_gradient_color_vec(self, positions, emotions_sorted, blend_start=None, rng=None):
         """
-        두 색상 블렌딩
+        부드러운 그라데이션 색상 (위치 배열 전체를 한 번에 계산)
+        
+        Parameters:
+        - positions: 0~100 위치 배열 (임의 shape)
+        - emotions_sorted: [(감정, 비율), ...] (비율 내림차순)
+        - blend_start: 블렌드 시작점 (None이면 위치마다 0.5~0.7 랜덤)
+        - rng: blend_start가 None일 때 사용할 NumPy 난수 생성기 (None이면 새로 생성)
+        
+        Returns:
+        - np.ndarray: positions.shape + (3,) RGB (float32)
         """
-        r = int(color1[0] * (1 - ratio) + color2[0] * ratio)
-        g = int(color1[1] * (1 - ratio) + color2[1] * ratio)
-        b = int(color1[2] * (1 - ratio) + color2[2] * ratio)
-        return (r, g, b)
+        positions = np.asarray(positions, dtype=np.float32)
+        starts, ends, colors1, colors2, has_next = self._gradient_segments(emotions_sorted)
+        
+        # 구간 밖 (또는 감정 없음) → 첫 감정 색상
+        result = np.empty(positions.shape + (3,), dtype=np.float32)
+        result[...] = self._palette[self._emotion_idx[emotions_sorted[0][0]]]
+        
+        if len(starts) == 0:
+            return result
+        
+        # 위치가 속한 구간 (경계값은 앞 구간에 포함)
+        idx = np.searchsorted(ends, positions, side='left')
+        inside = idx < len(ends)
+        idx = np.minimum(idx, len(ends) - 1)
+        inside &= starts[idx] <= positions
+        
+        local_ratio = (positions - starts[idx]) / (ends[idx] - starts[idx])
+        
+        if blend_start is None:
+            if rng is None:
+                rng = np.random.default_rng()
+            blend_start = self._uniform(rng, 0.5, 0.7, size=positions.shape)
+        
+        # 다음 감정과 블렌딩
+        blend = has_next[idx] & (local_ratio > blend_start)
+        blend_ratio = np.where(blend, (local_ratio - blend_start) / (1 - blend_start), 0.0)
+        blend_ratio = blend_ratio[..., None]
+        
+        colors = colors1[idx] * (1 - blend_ratio) + colors2[idx] * blend_ratio
+        result[inside] = colors[inside]
+        
+        return result
     
-    def _enhance_colors(self, image):
+    def _enhance_colors(self, image, rnd):
         """
         색상 강화 (랜덤 강도)
         """
-        # 랜덤 채도
-        saturation = random.uniform(1.3, 1.6)
-        enhancer = ImageEnhance.Color(image)
-        image = enhancer.enhance(saturation)
-        
-        # 랜덤 대비
-        contrast = random.uniform(1.1, 1.4)
-        enhancer = ImageEnhance.Contrast(image)
-        image = enhancer.enhance(contrast)
+        # 랜덤 채도 / 대비
+        saturation = rnd.uniform(1.3, 1.6)
+        contrast = rnd.uniform(1.1, 1.4)
+        
+        # 채도(회색과 블렌딩) + 대비(평균 밝기와 블렌딩)는 모두 RGB 선형 변환
+        # → 하나의 색 변환 행렬로 합쳐 한 번에 적용
+        # (채도 보정은 밝기를 바꾸지 않으므로 평균 밝기는 원본 기준)
+        mean = ImageStat.Stat(image.convert('L')).mean[0]
+        matrix = []
+        for channel in range(3):
+            matrix += [
+                contrast * ((1 - saturation) * LUMA_WEIGHTS[k] + (saturation if k == channel else 0))
+                for k in range(3)
+            ]
+            matrix.append((1 - contrast) * mean)
+        image = image.convert('RGB', tuple(matrix))
         
         # 랜덤 선명도
-        sharpness = random.uniform(1.0, 1.3)
-        enhancer = ImageEnhance.Sharpness(image)
-        image = enhancer.enhance(sharpness)
+        # ImageEnhance.Sharpness = SMOOTH 필터 결과와 블렌딩 → 3x3 커널 하나로 합쳐 한 번에 적용
+        # (SMOOTH 커널: 주변 1, 중앙 5, 합 13)
+        sharpness = rnd.uniform(1.0, 1.3)
+        kernel = [(1 - sharpness) / 13] * 9
+        kernel[4] = sharpness + (1 - sharpness) * 5 / 13
+        image = image.filter(ImageFilter.Kernel((3, 3), kernel, scale=1))
         
         print(f"   🎨 색상 보정: 채도 {saturation:.2f}, 대비 {contrast:.2f}, 선명도 {sharpness:.2f}")
         
@@ -450,13 +906,28 @@ class ImageGenerator:
 
 
 # 테스트
+def _render_test_image(args):
+    """
+    테스트용 이미지 1장 생성 (프로세스 풀 작업 단위)
+    
+    Parameters:
+    - args: (감정 딕셔너리, 저장 경로, 스타일)
+    
+    Returns:
+    - save_path: 저장된 파일 경로
+    """
+    emotion_percentages, save_path, style = args
+    ImageGenerator().generate_image(emotion_percentages, save_path=save_path, style=style)
+    return save_path
+
+
 if __name__ == "__main__":
+    from concurrent.futures import ProcessPoolExecutor
+    
     print("=" * 60)
     print("예술적 감정 그라데이션 아트 생성기 (랜덤 변형)")
     print("=" * 60)
     
-    generator = ImageGenerator()
-    
     # 테스트 감정
     test_emotions = {
         '기쁨': 45.5,
@@ -467,14 +938,10 @@ if __name__ == "__main__":
         '당황': 2.0
     }
     
-    # 같은 스타일을 3번 생성 (매번 다른 결과)
+    # 같은 스타일을 3번 생성 (매번 다른 결과) - 서로 독립적이므로 프로세스별로 병렬 생성
     style = 'dynamic'
+    jobs = [(test_emotions, f'test_{style}_{i+1}.png', style) for i in range(3)]
     
-    for i in range(3):
-        print(f"\n{'='*60}")
-        print(f"생성 #{i+1} - {style} 스타일")
-        image = generator.generate_image(
-            test_emotions, 
-            save_path=f'test_{style}_{i+1}.png',
-            style=style
-        )
+    with ProcessPoolExecutor(max_workers=min(len(jobs), os.cpu_count() or 1)) as executor:
+        for i, save_path in enumerate(executor.map(_render_test_image, jobs)):
+            print(f"✓ 생성 #{i+1} - {style} 스타일: {save_path}")
@@ -1,18 +1,33 @@
 import spotipy
-from spotipy.oauth2 import SpotifyClientCredentials
+from spotipy.oauth2 import SpotifyClientCredentials, SpotifyOauthError
 import os
+import numpy as np
 import random
+import threading
 import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 
 
 class MusicRecommender:
-    def __init__(self):
-        """Spotify API 초기화"""
+    def __init__(self, client_id=None, client_secret=None):
+        """
+        Spotify API 초기화
+        
+        Parameters:
+        - client_id, client_secret: Spotify API 키 (없으면 환경 변수 사용)
+        """
         self.sp = None
         
+        # 검색 결과 TTL + LRU 캐시 ((키워드, 개수) → (저장 시각, 트랙 리스트))
+        self.search_cache = OrderedDict()
+        self.search_cache_size = 64
+        self.search_cache_ttl = 3600
+        self._search_cache_lock = threading.Lock()
+        
         try:
-            client_id = os.getenv('SPOTIFY_CLIENT_ID')
-            client_secret = os.getenv('SPOTIFY_CLIENT_SECRET')
+            client_id = client_id or os.getenv('SPOTIFY_CLIENT_ID')
+            client_secret = client_secret or os.getenv('SPOTIFY_CLIENT_SECRET')
             
             # API 키 확인
             if not client_id or not client_secret:
@@ -33,11 +48,11 @@ class MusicRecommender:
                 requests_timeout=10  # ✅ 타임아웃 설정
             )
             
-            # 연결 테스트
-            self.sp.search(q='test', limit=1)
+            # 연결 테스트: 액세스 토큰 발급 (검색 요청 없이 인증 확인 + 토큰 캐시)
+            client_credentials_manager.get_access_token(as_dict=False)
             print("✓ Spotify API 연결 성공")
             
-        except spotipy.exceptions.SpotifyException as e:
+        except (spotipy.exceptions.SpotifyException, SpotifyOauthError) as e:
             print(f"❌ Spotify API 인증 실패: {e}")
             print("   API 키를 확인해주세요.")
             self.sp = None
@@ -58,9 +73,82 @@ class MusicRecommender:
     }
     
     
+    def _search_tracks(self, keyword, limit):
+        """
+        키워드로 Spotify 트랙 검색 (결과는 TTL 동안 캐시)
+        
+        Parameters:
+        - keyword: 검색 키워드
+        - limit: 가져올 트랙 수
+        
+        Returns:
+        - list: 트랙 정보 리스트 (캐시와 공유, 수정 금지)
+        """
+        key = (keyword, limit)
+        
+        with self._search_cache_lock:
+            cached = self.search_cache.get(key)
+            if cached and time.monotonic() - cached[0] < self.search_cache_ttl:
+                self.search_cache.move_to_end(key)
+                return cached[1]
+        
+        # Spotify 검색 (재시도 로직 추가)
+        max_retries = 3
+        for attempt in range(max_retries):
+            try:
+                results = self.sp.search(
+                    q=keyword,
+                    type='track',
+                    limit=limit,
+                    market='KR'
+                )
+                break  # 성공하면 루프 탈출
+                
+            except Exception as e:
+                if attempt < max_retries - 1:
+                    print(f"⚠️  재시도 중... ({attempt + 1}/{max_retries})")
+                    time.sleep(1)
+                else:
+                    raise e
+        
+        # 응답 JSON 전체 대신 필요한 정보만 저장
+        tracks = []
+        for item in results['tracks']['items']:
+            # None 체크 추가
+            if not item or not item.get('name'):
+                continue
+            
+            track_info = {
+                'name': item['name'],
+                'artist': ', '.join([artist['name'] for artist in item.get('artists', [])]),
+                'url': item.get('external_urls', {}).get('spotify', ''),
+                'preview_url': item.get('preview_url'),
+                'popularity': item.get('popularity', 0),
+                'keyword': keyword
+            }
+            
+            # 필수 정보가 있는 트랙만 추가
+            if track_info['name'] and track_info['url']:
+                tracks.append(track_info)
+        
+        with self._search_cache_lock:
+            self.search_cache[key] = (time.monotonic(), tracks)
+            self.search_cache.move_to_end(key)
+            if len(self.search_cache) > self.search_cache_size:
+                self.search_cache.popitem(last=False)
+        
+        return tracks
+    
+    
+    def clear_cache(self):
+        """검색 결과 캐시 비우기"""
+        with self._search_cache_lock:
+            self.search_cache.clear()
+    
+    
     def get_top_tracks_for_emotion(self, emotion, limit=50):
         """
-        특정 감정에 맞는 인기 TOP 50 트랙 가져오기
+        특정 감정에 맞는 추천 후보 트랙 가져오기 (검색 결과 순서, 인기도는 샘플링 가중치로 사용)
         
         Parameters:
         - emotion: 감정 ('기쁨', '슬픔', ...)
@@ -80,47 +168,10 @@ class MusicRecommender:
             
             print(f"🔍 '{emotion}' 감정 검색: 키워드 '{selected_keyword}'")
             
-            # Spotify 검색 (재시도 로직 추가)
-            max_retries = 3
-            for attempt in range(max_retries):
-                try:
-                    results = self.sp.search(
-                        q=selected_keyword,
-                        type='track',
-                        limit=limit,
-                        market='KR'
-                    )
-                    break  # 성공하면 루프 탈출
-                    
-                except Exception as e:
-                    if attempt < max_retries - 1:
-                        print(f"⚠️  재시도 중... ({attempt + 1}/{max_retries})")
-                        time.sleep(1)
-                    else:
-                        raise e
-            
-            tracks = []
-            for item in results['tracks']['items']:
-                # None 체크 추가
-                if not item or not item.get('name'):
-                    continue
-                
-                track_info = {
-                    'name': item['name'],
-                    'artist': ', '.join([artist['name'] for artist in item.get('artists', [])]),
-                    'url': item.get('external_urls', {}).get('spotify', ''),
-                    'preview_url': item.get('preview_url'),
-                    'popularity': item.get('popularity', 0),
-                    'emotion': emotion,
-                    'keyword': selected_keyword
-                }
-                
-                # 필수 정보가 있는 트랙만 추가
-                if track_info['name'] and track_info['url']:
-                    tracks.append(track_info)
+            tracks = self._search_tracks(selected_keyword, limit)
             
-            # 인기도순 정렬
-            tracks = sorted(tracks, key=lambda x: x['popularity'], reverse=True)
+            # 감정 정보 추가 (캐시된 트랙 dict는 그대로 두고 복사본에 추가)
+            tracks = [dict(track, emotion=emotion) for track in tracks]
             
             print(f"✓ {len(tracks)}개 트랙 가져옴")
             
@@ -135,6 +186,31 @@ class MusicRecommender:
             return []
     
     
+    def _sample_by_popularity(self, tracks, count):
+        """
+        인기도 가중 무작위 선택 (중복 없음)
+        
+        Parameters:
+        - tracks: 후보 트랙 리스트
+        - count: 뽑을 트랙 수 (후보보다 많으면 후보 전체)
+        
+        Returns:
+        - list: 선택된 트랙 리스트
+        """
+        # +1: 인기도 0인 트랙도 후보로 유지
+        weights = np.array([track['popularity'] for track in tracks], dtype=np.float64) + 1
+        
+        # 인스턴스가 세션/스레드 간 공유되므로 호출마다 로컬 생성기 사용
+        rng = np.random.default_rng()
+        indices = rng.choice(
+            len(tracks),
+            size=min(count, len(tracks)),
+            replace=False,
+            p=weights / weights.sum()
+        )
+        return [tracks[i] for i in indices]
+    
+    
     def recommend_music_by_emotions(self, emotions_dict, total_tracks=10):
         """
         여러 감정 비율에 따라 음악 추천
@@ -200,23 +276,23 @@ class MusicRecommender:
         for emotion, count in emotion_track_counts.items():
             print(f"  {emotion}: {count}곡")
         
-        # 각 감정별로 트랙 가져오기
+        # 각 감정별로 후보 50곡 가져오기 (서로 독립적인 네트워크 요청 → 병렬 검색)
+        print(f"\n🎼 {len(emotion_track_counts)}개 감정 트랙 가져오는 중...")
+        
+        with ThreadPoolExecutor(max_workers=len(emotion_track_counts)) as executor:
+            top_tracks_list = list(executor.map(
+                lambda emotion: self.get_top_tracks_for_emotion(emotion, limit=50),
+                emotion_track_counts
+            ))
+        
         all_tracks = []
         
-        for emotion, count in emotion_track_counts.items():
-            print(f"\n🎼 '{emotion}' 감정 트랙 가져오는 중...")
-            
-            # TOP 50에서 가져오기
-            top_tracks = self.get_top_tracks_for_emotion(emotion, limit=50)
-            
+        for (emotion, count), top_tracks in zip(emotion_track_counts.items(), top_tracks_list):
             if top_tracks:
-                # 무작위로 선택
-                selected = random.sample(
-                    top_tracks, 
-                    min(count, len(top_tracks))
-                )
+                # 인기도 가중 무작위 선택
+                selected = self._sample_by_popularity(top_tracks, count)
                 all_tracks.extend(selected)
-                print(f"✓ {len(selected)}곡 선택됨")
+                print(f"✓ '{emotion}' {len(selected)}곡 선택됨")
             else:
                 print(f"⚠️  '{emotion}' 트랙을 찾을 수 없습니다.")
         
@@ -254,14 +330,14 @@ class MusicRecommender:
         try:
             print(f"\n🎵 '{main_emotion}' 감정으로 {limit}곡 추천")
             
-            # TOP 50에서 무작위 선택
+            # 후보 50곡에서 인기도 가중 무작위 선택
             top_tracks = self.get_top_tracks_for_emotion(main_emotion, limit=50)
             
             if not top_tracks:
                 print(f"⚠️  '{main_emotion}' 감정의 트랙을 찾을 수 없습니다.")
                 return []
             
-            selected = random.sample(top_tracks, min(limit, len(top_tracks)))
+            selected = self._sample_by_popularity(top_tracks, limit)
             
             print(f"✓ {len(selected)}곡 추천 완료")
             
@@ -1,9 +1,18 @@
 import os
+import sys
 import json
+import hashlib
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
 import pandas as pd
 from tqdm import tqdm
 from sklearn.model_selection import train_test_split
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 # 간단 명확한 매핑 (E10~E69를 10단위로)
 # 분노: E10~E19 → 0
 # 슬픔: E20~E29 → 1
@@ -14,118 +23,190 @@ from sklearn.model_selection import train_test_split
 
 EMOTIONS = ['분노', '슬픔', '불안', '상처', '당황', '기쁨']
 
-def get_emotion_from_code(emotion_code):
+SPLITS = ('train', 'val', 'test')
+
+# 전처리 로직이 바뀌면 올려서 기존 캐시 무효화
+PREPROCESS_VERSION = 1
+
+# Human Speech 키 (HS01, HS02, ...) - 항목마다 키 정렬/필터 대신 정해진 순서로 조회
+HS_KEYS = tuple(f'HS{i:02d}' for i in range(1, 30))
+
+def get_emotion_from_codes(emotion_codes):
     """
-    감정 코드를 6가지 감정으로 매핑
+    감정 코드 배열을 6가지 감정으로 한 번에 매핑 (항목별 Python 분기 없이)
     E10~E19 → 0 (분노)
     E20~E29 → 1 (슬픔)
     E30~E39 → 2 (불안)
     E40~E49 → 3 (상처)
     E50~E59 → 4 (당황)
     E60~E69 → 5 (기쁨)
+    
+    Parameters:
+    - emotion_codes: 감정 코드 시퀀스 ('E10', 'E25', ...)
+    
+    Returns:
+    - np.ndarray: 감정 번호 (int64, 범위 밖이거나 잘못된 코드는 -1)
     """
-    try:
-        # E10 → 10, E25 → 25
-        code_num = int(emotion_code[1:])
-        
-        if 10 <= code_num <= 19:
-            return 0  # 분노
-        elif 20 <= code_num <= 29:
-            return 1  # 슬픔
-        elif 30 <= code_num <= 39:
-            return 2  # 불안
-        elif 40 <= code_num <= 49:
-            return 3  # 상처
-        elif 50 <= code_num <= 59:
-            return 4  # 당황
-        elif 60 <= code_num <= 69:
-            return 5  # 기쁨
-    except:
-        pass
+    # E10 → 10, E25 → 25 (int()로 읽히는 정수만 허용, 'E10.5'/'E1e1' 등은 -1)
+    digits = pd.Series(emotion_codes, dtype='string').str[1:]
+    is_int = digits.str.fullmatch(r'\s*[+-]?\d+\s*').fillna(False).to_numpy(bool)
+    code_nums = pd.to_numeric(digits.where(is_int), errors='coerce').fillna(-1).to_numpy(np.int64)
     
-    return None
+    return np.where((code_nums >= 10) & (code_nums <= 69), code_nums // 10 - 1, -1)
 
 def extract_text_emotion(item):
-    """JSON에서 텍스트와 감정 추출"""
+    """JSON에서 텍스트와 감정 코드 추출 (감정 매핑은 get_emotion_from_codes로 일괄 처리)"""
     try:
         emotion_code = item['profile']['emotion']['type']
-        emotion = get_emotion_from_code(emotion_code)
-        
-        if emotion is None:
-            return None, None
         
         talk = item.get('talk', {})
         content = talk.get('content', {})
         
         # Human Speech (HS01, HS02, ...) 추출
         text_parts = []
-        for key in sorted(content.keys()):
-            if key.startswith('HS'):
-                text = content[key]
-                if text and len(str(text).strip()) > 3:
-                    text_parts.append(str(text).strip())
+        for key in HS_KEYS:
+            text = content.get(key)
+            if text:
+                text = str(text).strip()
+                if len(text) > 3:
+                    text_parts.append(text)
         
         if text_parts:
             full_text = ' '.join(text_parts)
-            return full_text, emotion
+            return full_text, emotion_code
     
     except:
         pass
     
     return None, None
 
+def _process_file(json_file):
+    """
+    JSON 파일 하나에서 텍스트와 감정 코드 추출 (프로세스 풀 작업 단위)
+    
+    Parameters:
+    - json_file: JSON 파일 경로
+    
+    Returns:
+    - (texts, emotion_codes): 같은 길이의 두 리스트 (읽기 실패 시 빈 리스트)
+    """
+    texts, emotion_codes = [], []
+    try:
+        # orjson이 있으면 바이트를 C 파서로 바로 디코딩 (없으면 표준 json)
+        with open(json_file, 'rb') as f:
+            raw = f.read()
+        data = orjson.loads(raw) if orjson is not None else json.loads(raw.decode('utf-8'))
+        items = data if isinstance(data, list) else [data]
+        
+        for item in items:
+            text, emotion_code = extract_text_emotion(item)
+            if text:
+                texts.append(text)
+                emotion_codes.append(emotion_code)
+    except:
+        pass
+    
+    return texts, emotion_codes
+
+def _iter_json_files(directory):
+    """
+    디렉토리 아래 JSON 파일 경로를 재귀적으로 나열 (os.scandir의 DirEntry 캐시로 추가 stat 없이)
+    
+    os.walk와 같은 순서 (디렉토리별로 파일 먼저, 그다음 하위 디렉토리)
+    
+    Parameters:
+    - directory: 탐색할 디렉토리
+    
+    Returns:
+    - generator: JSON 파일 경로
+    """
+    subdirs = []
+    try:
+        with os.scandir(directory) as entries:
+            for entry in entries:
+                if entry.is_dir(follow_symlinks=False):
+                    subdirs.append(entry.path)
+                elif entry.name.endswith('.json'):
+                    yield entry.path
+    except OSError:
+        return
+    
+    for subdir in subdirs:
+        yield from _iter_json_files(subdir)
+
 def process_directory(directory):
-    """디렉토리의 모든 JSON 파일 처리"""
-    data_list = []
+    """
+    디렉토리의 모든 JSON 파일 처리 (파일별 파싱은 프로세스 풀에서 병렬로)
     
-    json_files = []
-    for root, dirs, files in os.walk(directory):
-        for file in files:
-            if file.endswith('.json'):
-                json_files.append(os.path.join(root, file))
+    Parameters:
+    - directory: AI Hub JSON 디렉토리
+    
+    Returns:
+    - pd.DataFrame: 'text', 'emotion' 컬럼 (6가지 감정으로 매핑되는 행만)
+    """
+    # 행별 dict 대신 컬럼별 리스트로 모아서 DataFrame 생성 시 복사 한 번으로
+    texts, emotion_codes = [], []
+    
+    json_files = list(_iter_json_files(directory))
     
     print(f"  JSON 파일: {len(json_files)}개")
     
-    for json_file in tqdm(json_files, desc="  처리 중"):
-        try:
-            with open(json_file, 'r', encoding='utf-8') as f:
-                data = json.load(f)
-                items = data if isinstance(data, list) else [data]
-                
-                for item in items:
-                    text, emotion = extract_text_emotion(item)
-                    if text and emotion is not None:
-                        data_list.append({
-                            'text': text,
-                            'emotion': emotion
-                        })
-        except:
-            pass
-    
-    return data_list
+    # JSON 디코딩은 CPU 작업이므로 프로세스별로 나눠 GIL 없이 병렬 처리
+    with ProcessPoolExecutor(max_workers=os.cpu_count()) as executor:
+        results = executor.map(_process_file, json_files, chunksize=32)
+        for file_texts, file_codes in tqdm(results, total=len(json_files), desc="  처리 중"):
+            texts.extend(file_texts)
+            emotion_codes.extend(file_codes)
+    
+    # 감정 코드 → 감정 번호 (전체 열을 한 번에 매핑 후 범위 밖 코드 제거)
+    df = pd.DataFrame({
+        'text': texts,
+        'emotion': get_emotion_from_codes(emotion_codes)
+    })
+    del texts, emotion_codes
+    
+    return df[df['emotion'] >= 0].reset_index(drop=True)
 
-def main():
-    """전체 전처리 프로세스"""
-    print("=" * 60)
-    print("AI Hub 감성 대화 데이터 전처리")
-    print("6가지 감정 (분노, 슬픔, 불안, 상처, 당황, 기쁨)")
-    print("=" * 60)
+def _cache_key(directories):
+    """
+    원본 JSON 파일 목록(경로, 크기, 수정 시각)으로 전처리 캐시 키 생성
+    
+    Parameters:
+    - directories: 원본 데이터 디렉토리 목록
+    
+    Returns:
+    - str: 16자리 16진수 키 (파일이 추가/삭제/수정되면 바뀜)
+    """
+    digest = hashlib.blake2b(f'v{PREPROCESS_VERSION}'.encode(), digest_size=8)
     
+    for directory in directories:
+        digest.update(f'\0{directory}\0'.encode('utf-8'))
+        for json_file in _iter_json_files(directory):
+            stat = os.stat(json_file)
+            digest.update(f'{json_file}\0{stat.st_size}\0{stat.st_mtime_ns}\n'.encode('utf-8'))
+    
+    return digest.hexdigest()
+
+def build_splits(train_dir, val_dir):
+    """
+    원본 JSON → 학습/검증/테스트 DataFrame (중복 제거 + 검증 세트 절반을 테스트로 분리)
+    
+    Parameters:
+    - train_dir: Training 원본 디렉토리
+    - val_dir: Validation 원본 디렉토리
+    
+    Returns:
+    - (train_df, val_df, test_df)
+    """
     # Training 데이터
     print("\n[1/2] Training 데이터 처리")
-    train_dir = 'data/raw/Training'
-    train_data = process_directory(train_dir)
-    print(f"  ✓ 추출: {len(train_data)}개")
+    train_df = process_directory(train_dir)
+    print(f"  ✓ 추출: {len(train_df)}개")
     
     # Validation 데이터
     print("\n[2/2] Validation 데이터 처리")
-    val_dir = 'data/raw/Validation'
-    val_data = process_directory(val_dir)
-    print(f"  ✓ 추출: {len(val_data)}개")
-    
-    # DataFrame 생성
-    train_df = pd.DataFrame(train_data)
-    val_df = pd.DataFrame(val_data)
+    val_df = process_directory(val_dir)
+    print(f"  ✓ 추출: {len(val_df)}개")
     
     # 중복 제거
     train_df = train_df.drop_duplicates(subset=['text'])
@@ -162,6 +243,36 @@ def main():
         stratify=val_df['emotion']
     )
     
+    return train_df, val_df, test_df
+
+def main(save_csv=False):
+    """
+    전체 전처리 프로세스 (원본이 그대로면 캐시된 결과를 바로 사용)
+    
+    Parameters:
+    - save_csv: True면 Parquet과 함께 CSV도 저장
+    """
+    print("=" * 60)
+    print("AI Hub 감성 대화 데이터 전처리")
+    print("6가지 감정 (분노, 슬픔, 불안, 상처, 당황, 기쁨)")
+    print("=" * 60)
+    
+    train_dir = 'data/raw/Training'
+    val_dir = 'data/raw/Validation'
+    
+    cache_dir = os.path.join('data', 'cache', _cache_key([train_dir, val_dir]))
+    cache_files = [os.path.join(cache_dir, f'{split}.parquet') for split in SPLITS]
+    
+    if all(os.path.exists(path) for path in cache_files):
+        print(f"\n✓ 원본 변경 없음, 캐시 사용: {cache_dir}")
+        train_df, val_df, test_df = [pd.read_parquet(path) for path in cache_files]
+    else:
+        train_df, val_df, test_df = build_splits(train_dir, val_dir)
+        
+        os.makedirs(cache_dir, exist_ok=True)
+        for df, path in zip((train_df, val_df, test_df), cache_files):
+            df.to_parquet(path, index=False, compression='zstd')
+    
     print(f"\n{'='*60}")
     print(f"✓ 최종 데이터 크기:")
     print(f"   학습:   {len(train_df):7,}개")
@@ -169,16 +280,19 @@ def main():
     print(f"   테스트: {len(test_df):7,}개")
     print(f"   총합:   {len(train_df) + len(val_df) + len(test_df):7,}개")
     
-    # 저장
+    # 저장 (Parquet: CSV보다 읽기/쓰기가 빠르고 용량이 작음)
     os.makedirs('data', exist_ok=True)
-    train_df.to_csv('data/train.csv', index=False, encoding='utf-8-sig')
-    val_df.to_csv('data/val.csv', index=False, encoding='utf-8-sig')
-    test_df.to_csv('data/test.csv', index=False, encoding='utf-8-sig')
+    saved = []
+    for split, df in zip(SPLITS, (train_df, val_df, test_df)):
+        df.to_parquet(f'data/{split}.parquet', index=False, compression='zstd')
+        saved.append(f'data/{split}.parquet')
+        if save_csv:
+            df.to_csv(f'data/{split}.csv', index=False, encoding='utf-8-sig')
+            saved.append(f'data/{split}.csv')
     
     print("\n✓ 저장 완료:")
-    print("   - data/train.csv")
-    print("   - data/val.csv")
-    print("   - data/test.csv")
+    for path in saved:
+        print(f"   - {path}")
     
     print("\n" + "=" * 60)
     print("✅ 전처리 완료!")
@@ -186,4 +300,4 @@ def main():
     print("=" * 60)
 
 if __name__ == "__main__":
-    main()
+    main(save_csv='--csv' in sys.argv[1:])
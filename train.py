@@ -1,11 +1,43 @@
+import io
+import os
 import torch
 import torch.nn as nn
 from torch.optim import AdamW
 from torch.optim.lr_scheduler import CosineAnnealingWarmRestarts
 from tqdm import tqdm
+from concurrent.futures import ThreadPoolExecutor
 from dataset import create_data_loaders
 from emotion_analyzer import EmotionClassifier, EMOTIONS
 
+def _save_checkpoint_async(executor, state_dict, path, previous=None):
+    """
+    모델 가중치를 메모리에서 직렬화한 뒤 파일 쓰기는 백그라운드 스레드에서 수행
+    (임시 파일에 쓴 후 os.replace 로 교체 → 중간에 끊겨도 기존 파일 유지)
+    
+    Parameters:
+    - executor: 저장용 ThreadPoolExecutor (max_workers=1)
+    - state_dict: 저장할 모델 가중치
+    - path: 저장 경로
+    - previous: 이전 저장 Future (끝날 때까지 기다린 후 새로 저장, 쓰기 오류는 여기서 다시 발생)
+    
+    Returns:
+    - Future: 저장 작업 (결과 파일을 읽기 전에 result() 호출 필요)
+    """
+    if previous is not None:
+        previous.result()
+    
+    buffer = io.BytesIO()
+    torch.save(state_dict, buffer)
+    data = buffer.getvalue()
+    
+    def write():
+        tmp_path = path + '.tmp'
+        with open(tmp_path, 'wb') as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+    
+    return executor.submit(write)
+
 def train_improved():
     """
     개선된 학습 (BERT 일부 학습)
@@ -39,6 +71,16 @@ def train_improved():
     print(f"✓ BERT 마지막 2개 레이어 + Classifier 학습")
     print(f"✓ 학습 파라미터: {trainable:,}개")
     
+    # torch.compile 로 커널 융합 (GPU 전용, 실패 시 eager 모드)
+    # 배치마다 동적 패딩으로 길이가 달라지므로 dynamic shape로 컴파일
+    # Module.compile 은 제자리 컴파일이라 state_dict 키가 그대로 유지됨
+    if device.type == 'cuda':
+        try:
+            model.compile(dynamic=True)
+            print("✓ torch.compile 적용")
+        except Exception as e:
+            print(f"⚠️  torch.compile 실패, eager 모드 사용: {e}")
+    
     # 옵티마이저 (서로 다른 학습률)
     optimizer = AdamW([
         {'params': [p for n, p in model.bert.named_parameters() if p.requires_grad], 
@@ -52,72 +94,96 @@ def train_improved():
     
     criterion = nn.CrossEntropyLoss()
     
+    # 혼합 정밀도 (GPU 전용): BF16 지원 시 BF16, 아니면 FP16 + 손실 스케일링
+    use_amp = device.type == 'cuda'
+    amp_dtype = torch.bfloat16 if use_amp and torch.cuda.is_bf16_supported() else torch.float16
+    scaler = torch.amp.GradScaler('cuda', enabled=use_amp and amp_dtype == torch.float16)
+    if use_amp:
+        print(f"✓ 혼합 정밀도 학습: {str(amp_dtype).replace('torch.', '')}")
+    
     print(f"\n학습 시작 (최대 30 에포크)")
     print("=" * 60)
     
+    # 그래디언트 누적 (배치 16 × 4 = 실효 배치 64, optimizer.step 횟수 1/4)
+    accum_steps = 4
+    
     best_val_acc = 0
     patience = 0
+    save_executor = ThreadPoolExecutor(max_workers=1)
+    save_future = None
     max_patience = 7
     
     for epoch in range(1, 31):
         # 학습
         model.train()
-        train_loss = 0
-        train_correct = 0
+        # 손실/정답 수는 GPU 텐서로 누적 (배치마다 .item() 동기화 없이 에포크 끝에 한 번)
+        train_loss_t = torch.zeros((), device=device)
+        train_correct_t = torch.zeros((), dtype=torch.long, device=device)
         train_total = 0
         
-        for batch in tqdm(train_loader, desc=f'Epoch {epoch:2d}'):
-            input_ids = batch['input_ids'].to(device)
-            attention_mask = batch['attention_mask'].to(device)
-            labels = batch['label'].to(device)
+        optimizer.zero_grad(set_to_none=True)
+        
+        for step, batch in enumerate(tqdm(train_loader, desc=f'Epoch {epoch:2d}')):
+            input_ids = batch['input_ids'].to(device, non_blocking=True)
+            attention_mask = batch['attention_mask'].to(device, non_blocking=True)
+            labels = batch['label'].to(device, non_blocking=True)
             
-            optimizer.zero_grad()
-            outputs = model(input_ids, attention_mask)
-            loss = criterion(outputs, labels)
-            loss.backward()
+            with torch.autocast(device_type=device.type, dtype=amp_dtype, enabled=use_amp):
+                outputs = model(input_ids, attention_mask)
+                loss = criterion(outputs, labels)
+            # 에포크 마지막 그룹은 accum_steps보다 짧을 수 있으므로 실제 배치 수로 나눔
+            group_start = step - step % accum_steps
+            group_size = min(accum_steps, len(train_loader) - group_start)
+            scaler.scale(loss / group_size).backward()
             
-            # Gradient clipping
-            torch.nn.utils.clip_grad_norm_(model.parameters(), 1.0)
-            optimizer.step()
+            # accum_steps 배치마다 (또는 에포크 마지막 배치에서) 한 번만 업데이트
+            if (step + 1) % accum_steps == 0 or step + 1 == len(train_loader):
+                # Gradient clipping (스케일 해제 후 원래 크기 기준으로)
+                scaler.unscale_(optimizer)
+                torch.nn.utils.clip_grad_norm_(model.parameters(), 1.0)
+                scaler.step(optimizer)
+                scaler.update()
+                optimizer.zero_grad(set_to_none=True)
             
-            train_loss += loss.item()
-            _, preds = torch.max(outputs, 1)
-            train_correct += (preds == labels).sum().item()
+            train_loss_t += loss.detach().float()
+            train_correct_t += (outputs.argmax(1) == labels).sum()
             train_total += labels.size(0)
         
         # 검증
         model.eval()
-        val_loss = 0
-        val_correct = 0
+        val_loss_t = torch.zeros((), device=device)
+        val_correct_t = torch.zeros((), dtype=torch.long, device=device)
         val_total = 0
         
-        emotion_correct = [0] * 6
-        emotion_total = [0] * 6
+        # 감정별 정답/전체 개수 (GPU 텐서로 누적, 에포크 끝에 한 번만 동기화)
+        emotion_correct_t = torch.zeros(6, dtype=torch.long, device=device)
+        emotion_total_t = torch.zeros(6, dtype=torch.long, device=device)
         
         with torch.no_grad():
             for batch in val_loader:
-                input_ids = batch['input_ids'].to(device)
-                attention_mask = batch['attention_mask'].to(device)
-                labels = batch['label'].to(device)
+                input_ids = batch['input_ids'].to(device, non_blocking=True)
+                attention_mask = batch['attention_mask'].to(device, non_blocking=True)
+                labels = batch['label'].to(device, non_blocking=True)
                 
-                outputs = model(input_ids, attention_mask)
-                loss = criterion(outputs, labels)
+                with torch.autocast(device_type=device.type, dtype=amp_dtype, enabled=use_amp):
+                    outputs = model(input_ids, attention_mask)
+                    loss = criterion(outputs, labels)
                 
-                val_loss += loss.item()
-                _, preds = torch.max(outputs, 1)
-                val_correct += (preds == labels).sum().item()
+                val_loss_t += loss.float()
+                preds = outputs.argmax(1)
+                val_correct_t += (preds == labels).sum()
                 val_total += labels.size(0)
                 
-                for i in range(len(labels)):
-                    label = labels[i].item()
-                    emotion_total[label] += 1
-                    if preds[i] == labels[i]:
-                        emotion_correct[label] += 1
+                emotion_total_t += torch.bincount(labels, minlength=6)
+                emotion_correct_t += torch.bincount(labels[preds == labels], minlength=6)
         
-        train_loss /= len(train_loader)
-        val_loss /= len(val_loader)
-        train_acc = train_correct / train_total
-        val_acc = val_correct / val_total
+        emotion_correct = emotion_correct_t.tolist()
+        emotion_total = emotion_total_t.tolist()
+        
+        train_loss = train_loss_t.item() / len(train_loader)
+        val_loss = val_loss_t.item() / len(val_loader)
+        train_acc = train_correct_t.item() / train_total
+        val_acc = val_correct_t.item() / val_total
         
         print(f"\nEpoch {epoch}:")
         print(f"  학습   - Loss: {train_loss:.4f}, Acc: {train_acc:.4f}")
@@ -136,7 +202,7 @@ def train_improved():
         # 최고 모델 저장
         if val_acc > best_val_acc:
             best_val_acc = val_acc
-            torch.save(model.state_dict(), 'emotion_model_best.pth')
+            save_future = _save_checkpoint_async(save_executor, model.state_dict(), 'emotion_model_best.pth', save_future)
             print(f"  ✨ 최고 모델 저장! (Acc: {val_acc:.4f})")
             patience = 0
         else:
@@ -153,24 +219,27 @@ def train_improved():
     print("최종 테스트")
     print("=" * 60)
     
+    if save_future is not None:
+        save_future.result()
+    save_executor.shutdown()
     model.load_state_dict(torch.load('emotion_model_best.pth'))
     model.eval()
     
-    test_correct = 0
+    test_correct_t = torch.zeros((), dtype=torch.long, device=device)
     test_total = 0
     
     with torch.no_grad():
         for batch in test_loader:
-            input_ids = batch['input_ids'].to(device)
-            attention_mask = batch['attention_mask'].to(device)
-            labels = batch['label'].to(device)
+            input_ids = batch['input_ids'].to(device, non_blocking=True)
+            attention_mask = batch['attention_mask'].to(device, non_blocking=True)
+            labels = batch['label'].to(device, non_blocking=True)
             
-            outputs = model(input_ids, attention_mask)
-            _, preds = torch.max(outputs, 1)
-            test_correct += (preds == labels).sum().item()
+            with torch.autocast(device_type=device.type, dtype=amp_dtype, enabled=use_amp):
+                outputs = model(input_ids, attention_mask)
+            test_correct_t += (outputs.argmax(1) == labels).sum()
             test_total += labels.size(0)
     
-    test_acc = test_correct / test_total
+    test_acc = test_correct_t.item() / test_total
     
     print(f"\n✅ 테스트 정확도: {test_acc:.4f}")
     print(f"✅ 최고 검증 정확도: {best_val_acc:.4f}")